@@ -0,0 +1,101 @@
+// Clientside callbacks of the user tab.
+// These are pure transformations of the search input values, so they run in the browser
+// instead of making a server round-trip on every keystroke.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    user_tab: {
+        /**
+         * Checks whether a search input value is filled (not null/undefined and not only whitespace).
+         *
+         * @param {string|number|null|undefined} value - The raw input value
+         * @returns {boolean} True if the input holds a value
+         */
+        isFilled: function (value) {
+            if (value === null || value === undefined) {
+                return false;
+            }
+            // Numbers (type="number" inputs) are always filled, only strings can be whitespace
+            return typeof value === "number" || String(value).trim() !== "";
+        },
+
+        /**
+         * Parses a search input value into an ID.
+         *
+         * @param {string|number|null|undefined} value - The raw input value
+         * @returns {number|string|null} The ID, null if the input is empty or "INVALID" if it is not a
+         *     plain non-negative integer
+         */
+        parseId: function (value) {
+            if (!window.dash_clientside.user_tab.isFilled(value)) {
+                return null;
+            }
+            const text = String(value).trim();
+            return /^[0-9]+$/.test(text) ? parseInt(text, 10) : "INVALID";
+        },
+
+        /**
+         * Parses both search inputs into the shared parsed IDs store. Keystrokes that do not change
+         * the parsed IDs (whitespace, leading zeros, further typing in an invalid input) leave the
+         * store untouched, so the server callbacks depending on it are not triggered.
+         *
+         * @param {string|number|null} userValue - Value of the user ID search input
+         * @param {string|number|null} cardValue - Value of the card ID search input
+         * @param {Object|null} parsed - Current data of the parsed IDs store
+         * @returns {Object} {user_id, card_id} or no_update if the parsed IDs did not change
+         */
+        parseIds: function (userValue, cardValue, parsed) {
+            const userTab = window.dash_clientside.user_tab;
+            const next = {user_id: userTab.parseId(userValue), card_id: userTab.parseId(cardValue)};
+
+            if (parsed && parsed.user_id === next.user_id && parsed.card_id === next.card_id) {
+                return window.dash_clientside.no_update;
+            }
+            return next;
+        },
+
+        /**
+         * Disables the card ID input while a user ID is entered and vice versa. Only the filled state of the
+         * inputs matters, so further keystrokes that keep the disabled states leave the inputs untouched.
+         *
+         * @param {string|number|null} userValue - Value of the user ID search input
+         * @param {string|number|null} cardValue - Value of the card ID search input
+         * @param {boolean|null} cardDisabledNow - Current disabled state of the card ID search input
+         * @param {boolean|null} userDisabledNow - Current disabled state of the user ID search input
+         * @returns {Array} [card disabled, card className, user disabled, user className]
+         */
+        toggleInputs: function (userValue, cardValue, cardDisabledNow, userDisabledNow) {
+            const noUpdate = window.dash_clientside.no_update;
+            const baseClass = "search-bar-input no-spinner";
+            const cardDisabled = window.dash_clientside.user_tab.isFilled(userValue);
+            const userDisabled = window.dash_clientside.user_tab.isFilled(cardValue);
+
+            if (cardDisabled === Boolean(cardDisabledNow) && userDisabled === Boolean(userDisabledNow)) {
+                return [noUpdate, noUpdate, noUpdate, noUpdate];
+            }
+
+            return [
+                cardDisabled,
+                cardDisabled ? baseClass + " is-disabled" : baseClass,
+                userDisabled,
+                userDisabled ? baseClass + " is-disabled" : baseClass
+            ];
+        },
+
+        /**
+         * Builds the user tab heading from the entered card ID or user ID.
+         *
+         * @param {string|number|null} userId - Value of the user ID search input
+         * @param {string|number|null} cardId - Value of the card ID search input
+         * @param {string|null} headingNow - Currently displayed heading
+         * @returns {string} The heading text, or no_update if it did not change
+         */
+        updateTabHeading: function (userId, cardId, headingNow) {
+            let heading = "User";
+            if (window.dash_clientside.user_tab.isFilled(cardId)) {
+                heading = "Card-ID: " + cardId;
+            } else if (window.dash_clientside.user_tab.isFilled(userId)) {
+                heading = "User-ID: " + userId;
+            }
+            return heading === headingNow ? window.dash_clientside.no_update : heading;
+        }
+    }
+});
@@ -5,6 +5,9 @@ from dash import Input, Output, callback
 from frontend.component_ids import ID
 from backend.data_manager import DataManager
 
+dm: DataManager = DataManager.get_instance()
+
+
 # --- KPI: Total Fraud Cases ---
 @callback(
     Output(ID.FRAUD_KPI_TOTAL_FRAUD_DIV_ID, "children"),
@@ -27,7 +30,6 @@ def update_total_fraud_cases(_):
         str: A formatted string representing the total number of fraud cases,
         with commas as thousand separators.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     return f"{len(df_fraud):,}"
@@ -52,7 +54,6 @@ def update_total_transactions(_):
         str: The total number of transactions formatted as a string with commas separating
             thousands.
     """
-    dm = DataManager.get_instance()
     total_transactions = len(dm.df_transactions) if hasattr(dm, "df_transactions") else 0
     return f"{total_transactions:,}"
 
@@ -75,7 +76,6 @@ def update_fraud_ratio(_):
         str: The fraud ratio as a formatted string with two decimal places followed by
             a percent symbol (e.g., '12.34 %').
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     total_fraud = len(df_fraud)
@@ -103,7 +103,6 @@ def update_fraud_by_state(_):
         A Plotly Figure object containing the fraud statistics visualization by
         state. If no fraud cases are found in the data, returns an empty figure.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     if "merchant_state" not in df_fraud.columns or df_fraud.empty:
@@ -158,7 +157,6 @@ def update_online_vs_inperson(_):
         breakdown of fraud case occurrences categorized as either online or
         in-store. If no valid data is available, returns an empty figure.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     # Setze is_online, falls nicht vorhanden
@@ -202,7 +200,6 @@ def update_top_merchants(_):
         for the fraud amount displayed on each bar. Returns an empty figure if
         there is no adequate data available to process.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     if "is_online" not in df_fraud.columns and "merchant_city" in df_fraud.columns:
@@ -256,7 +253,6 @@ def update_fraud_by_age(_):
         shows the total fraud amount. Secondary information, like average fraud cost per
         case, is included in the hover tooltips.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     users = dm.df_users
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")].copy()
@@ -319,7 +315,6 @@ def update_fraud_by_gender(_):
             A pie chart showing fraud cases by gender with annotations that include
             total and average costs per gender.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     users = dm.df_users
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
@@ -380,7 +375,6 @@ def update_fraud_by_income(_):
         visualizing fraud by income distribution, including mean and median
         annotations.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     users = dm.df_users
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
@@ -442,7 +436,6 @@ def update_fraud_by_hour(_):
         plotly.graph_objects.Figure: A figure object representing the fraud pattern by hour,
             containing both a bar and a line chart.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")].copy()
     df_fraud["hour"] = pd.to_datetime(df_fraud["date"]).dt.hour
@@ -494,7 +487,6 @@ def update_fraud_by_weekday(_):
         plotly.graph_objects.Figure: A figure visualizing fraud data by weekday, including the total
         number of fraud cases per day, the total fraud amount, and the average fraud cost per case.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")].copy()
     df_fraud["weekday"] = pd.to_datetime(df_fraud["date"]).dt.day_name()
@@ -551,7 +543,6 @@ def update_fraud_by_amount(_):
         plotly.graph_objs._figure.Figure:
             A Plotly figure object representing a box plot of fraud transaction amounts.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     fig = px.box(df_fraud, y="amount", points="all", title="Fraud Transaction Amounts (Box Plot)")
@@ -582,14 +573,13 @@ def update_fraud_by_card_type(_):
         cases grouped by card type, with respective fraud amount annotations.
 
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
-    cards = dm.df_cards
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
-    merged = df_fraud.merge(cards, left_on="card_id", right_on="id", how="left")
-    card_counts = merged["card_type"].value_counts()
-    total_amount = merged["amount"].sum()
-    amount_per_type = merged.groupby("card_type")["amount"].sum().reindex(card_counts.index).fillna(0)
+    # Look up the card type through the card ID index instead of merging the whole cards table
+    card_types = df_fraud["card_id"].map(dm.df_cards_by_id["card_type"])
+    card_counts = card_types.value_counts()
+    total_amount = df_fraud["amount"].sum()
+    amount_per_type = df_fraud["amount"].groupby(card_types).sum().reindex(card_counts.index).fillna(0)
     bar_text = [f"{count:,} Cases<br>${amt:,.2f}" for count, amt in zip(card_counts.values, amount_per_type.values)]
     fig = px.bar(
         x=card_counts.index, y=card_counts.values,
@@ -622,12 +612,10 @@ def update_fraud_by_card_brand(_):
         plotly.graph_objs.Figure: A pie chart figure representing the count of fraudulent
         transactions for each card brand.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
-    cards = dm.df_cards
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
-    merged = df_fraud.merge(cards, left_on="card_id", right_on="id", how="left")
-    brand_counts = merged["card_brand"].value_counts()
+    # Look up the card brand through the card ID index instead of merging the whole cards table
+    brand_counts = df_fraud["card_id"].map(dm.df_cards_by_id["card_brand"]).value_counts()
     fig = px.pie(
         names=brand_counts.index,
         values=brand_counts.values,
@@ -697,7 +685,6 @@ def update_fraud_by_mcc(_):
         go.Figure: A Plotly line chart figure representing the top 10 merchant
             categories by total fraud costs, with markers for data points.
     """
-    dm = DataManager.get_instance()
     df = dm.df_transactions
     df_fraud = df[df["errors"].notnull() & (df["errors"] != "")]
     if "mcc" not in df_fraud.columns or df_fraud.empty:
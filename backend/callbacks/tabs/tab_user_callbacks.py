@@ -1,272 +1,316 @@
+from functools import lru_cache
+from itertools import cycle, islice
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from dash import Input, Output, callback, State
+from dash import Input, Output, callback, State, clientside_callback, ClientsideFunction, no_update
 from dash.exceptions import PreventUpdate
 
 import components.constants as const
 import components.factories.component_factory as comp_factory
+import utils.logger as logger
 from backend.callbacks.tabs.tab_merchant_callbacks import ID_TO_MERCHANT_TAB
 from backend.data_manager import DataManager
-from components.tabs.tab_user_components import get_valid_user_id, configure_chart_parameters, \
-    create_bar_chart_figure
+from components.tabs.tab_user_components import resolve_ids, get_valid_user_id, configure_chart_parameters, \
+    create_bar_chart_figure, TOP_MERCHANTS_LIMIT
 from frontend.component_ids import ID
 from frontend.layout.right.tabs.tab_user import create_kpi_value_text
 
 dm: DataManager = DataManager.get_instance()
 TEXT_EMPTY_KPI: str = "Waiting for input..."
 
+# Static KPI texts, built once at import (components are only serialized per response and never mutated)
+KPI_TEXT_EMPTY = create_kpi_value_text(TEXT_EMPTY_KPI, True)
+KPI_TEXT_INVALID = create_kpi_value_text("INVALID", True)
+KPI_TEXT_NO_DATA = create_kpi_value_text("NO DATA", True)
+KPIS_EMPTY = (KPI_TEXT_EMPTY,) * 4
+KPIS_INVALID = (KPI_TEXT_INVALID,) * 4
+KPIS_NO_DATA = (KPI_TEXT_NO_DATA,) * 4
+
+# KPI value formatters, bound once at import and shared by all KPI texts
+FORMAT_USD = "${:,.2f}".format
+FORMAT_COUNT = "{:,}".format
+
+# Empty placeholder figure as a ready-to-send dict (shared, must not be mutated)
+EMPTY_FIGURE: dict = comp_factory.create_empty_figure().to_plotly_json()
+
+# 9 Colors of the credit limit bar segments, as max num of credit cards is 9
+CREDIT_LIMIT_COLORS: tuple[str, ...] = (
+    "#36c36a",  # grün
+    "#5d9cf8",  # blau
+    "#f1b44c",  # gelb-orange
+    "#e74c3c",  # rot
+    "#8e44ad",  # lila
+    "#16a085",  # türkis
+    "#f06292",  # pink
+    "#f39c12",  # orange
+    "#7f8c8d",  # grau
+)
 
-# === Callback: KPI-Boxes (Transactions, Sum, Average, Cards) ===
-@callback(
-    Output(ID.USER_KPI_TX_COUNT, "children"),
-    Output(ID.USER_KPI_TX_SUM, "children"),
-    Output(ID.USER_KPI_TX_AVG, "children"),
-    Output(ID.USER_KPI_CARD_COUNT, "children"),
-    Input(ID.USER_ID_SEARCH_INPUT, "value"),
-    Input(ID.CARD_ID_SEARCH_INPUT, "value"),
+# Layout of the credit limit bar that is the same for every user (only the x-axis range differs)
+CREDIT_LIMIT_BAR_LAYOUT = dict(
+    barmode="stack",
+    uirevision="credit-limit-bar",  # Constant, so Plotly.react restyles the bar instead of resetting it
+    showlegend=False,
+    bargap=0,
+    margin=dict(l=0, r=0, t=0, b=0),
+    plot_bgcolor=const.COLOR_TRANSPARENT,
+    paper_bgcolor=const.COLOR_TRANSPARENT,
+    yaxis=dict(showticklabels=False, visible=False),
 )
-def update_user_kpis(user_id, card_id):
+
+
+@lru_cache(maxsize=4096)
+def _build_credit_limit_figure(user_id: int) -> dict:
     """
-    Updates user KPI metrics based on a given user ID or card ID. The KPIs updated include
-    the transaction count, total transaction sum, average transaction amount, and
-    card count associated with either the specified user or card. If no valid
-    user ID or card ID is provided, default values indicating no data or invalid input
-    are returned. In case of an error during the process, invalid KPI values are returned.
+    Builds the stacked credit limit bar for all cards of a user.
+
+    The result only depends on the (static) card data of the user, so it is memoized
+    per user ID and returned as a plain figure dict that Dash can send as is.
+    The returned dict is shared between calls and must not be mutated.
 
     Args:
-        user_id: The ID of the user used to fetch KPI data.
-        card_id: The ID of the card used to fetch KPI data.
+        user_id (int): The resolved user ID.
 
     Returns:
-        A tuple containing updated KPI values for:
-            - Transaction count.
-            - Total transaction sum formatted as currency.
-            - Average transaction amount formatted as currency.
-            - Card count.
+        dict: The figure dict of the credit limit bar, or of an empty figure if the
+            user has no cards.
+    """
+    card_limits = dm.user_tab_data.get_user_card_limits(user_id)
+    if card_limits is None:
+        return EMPTY_FIGURE
+
+    # Already sorted by credit limit (highest first)
+    limits, card_ids = card_limits
+    num_cards = len(limits)
+    positions = np.arange(num_cards)
+
+    # One trace for all cards: every segment sits on the same y category and gets stacked.
+    # NumPy arrays are passed as is, so Plotly ships them as compact typed arrays.
+    fig = go.Figure(go.Bar(
+        x=limits,
+        y=["Credit Limit"] * num_cards,
+        orientation="h",
+        marker=dict(color=list(islice(cycle(CREDIT_LIMIT_COLORS), num_cards)), line_width=0),
+        hovertemplate=(
+            "💳 <b>Card:</b> %{customdata[0]}<br>"
+            "🆔 <b>ID:</b> %{customdata[1]}<br>"
+            "💰 <b>Limit:</b> $%{x:,.2f}<extra></extra>"
+        ),
+        texttemplate="$%{x:,.2f}",  # Formatted in the browser, only the raw limits are sent
+        textposition="inside",
+        insidetextanchor="middle",
+        textfont=dict(size=14, color="white"),
+        customdata=np.column_stack((positions + 1, card_ids)),
+    ))
+
+    fig.update_layout(
+        CREDIT_LIMIT_BAR_LAYOUT,
+        xaxis=dict(
+            showticklabels=False,
+            visible=False,
+            range=[0, dm.user_tab_data.get_credit_limit(user_id=user_id)]
+        ),
+    )
+
+    return fig.to_plotly_json()
+
+
+@lru_cache(maxsize=4096)
+def _build_user_kpi_outputs(user_id: int | None, card_id: int | None) -> tuple:
     """
-    if (user_id is None or str(user_id).strip() == "") and (card_id is None or str(card_id).strip() == ""):
-        return (create_kpi_value_text(TEXT_EMPTY_KPI, True),) * 4
+    Builds the outputs of the KPI callback for resolved IDs.
+
+    The outputs only depend on the (static) precomputed KPI tables, so they are memoized
+    per normalized ID pair; "42" and 42 typed into a search input share one entry.
+    The returned components and figure dict are shared between calls and must not be
+    mutated.
+
+    Args:
+        user_id (int | None): The resolved user ID (None if the card is unknown).
+        card_id (int | None): The parsed card ID (None if searched by user ID).
+
+    Returns:
+        tuple: The outputs in the order documented in update_user_kpis.
+    """
+    credit_limit_bar = _build_credit_limit_figure(user_id) if user_id is not None else EMPTY_FIGURE
 
     try:
-        if card_id is not None and str(card_id).strip() != "":
-            data = dm.user_tab_data.get_card_kpis(int(card_id))
-        elif user_id is not None and str(user_id).strip() != "":
-            data = dm.user_tab_data.get_user_kpis(int(user_id))
+        if card_id is not None:
+            data = dm.user_tab_data.get_card_kpis(card_id)
         else:
-            return (create_kpi_value_text("INVALID", True),) * 4
+            data = dm.user_tab_data.get_user_kpis(user_id)
 
         # No data found
-        if data is None or (data["amount_of_transactions"] == 0 and data["amount_of_cards"] == 0):
-            return (create_kpi_value_text("NO DATA", True),) * 4
+        if data is None:
+            return KPIS_NO_DATA + (KPI_TEXT_NO_DATA, credit_limit_bar)
+
+        amount_of_transactions, total_sum, average_amount, amount_of_cards, credit_limit = data
+
+        # Users without cards have no credit limit
+        if amount_of_cards == 0 or pd.isna(credit_limit):
+            credit_limit_text = KPI_TEXT_NO_DATA
+        else:
+            credit_limit_text = create_kpi_value_text(FORMAT_USD(credit_limit))
+
+        if amount_of_transactions == 0 and amount_of_cards == 0:
+            return KPIS_NO_DATA + (credit_limit_text, credit_limit_bar)
 
         return (
-            create_kpi_value_text(f"{data['amount_of_transactions']:,}"),
-            create_kpi_value_text(f"${data['total_sum']:,.2f}"),
-            create_kpi_value_text(f"${data['average_amount']:,.2f}"),
-            create_kpi_value_text(f"{data['amount_of_cards']}"),
+            create_kpi_value_text(FORMAT_COUNT(amount_of_transactions)),
+            create_kpi_value_text(FORMAT_USD(total_sum)),
+            create_kpi_value_text(FORMAT_USD(average_amount)),
+            create_kpi_value_text(f"{amount_of_cards}"),
+            credit_limit_text,
+            credit_limit_bar,
         )
 
     except Exception as e:
-        print("Error (KPI-Boxes):", str(e))
-        return (
-            create_kpi_value_text("INVALID", True),
-        ) * 4
+        logger.log(f"⚠️ User: Error while building the KPI boxes: {e}", debug=True)
+        return KPIS_INVALID + (KPI_TEXT_INVALID, credit_limit_bar)
 
 
-# === Callback: Credit Limit Box ===
+# === Callback: KPI-Boxes (Transactions, Sum, Average, Cards), Credit Limit Box and Credit Limit Bar ===
 @callback(
+    Output(ID.USER_KPI_TX_COUNT, "children"),
+    Output(ID.USER_KPI_TX_SUM, "children"),
+    Output(ID.USER_KPI_TX_AVG, "children"),
+    Output(ID.USER_KPI_CARD_COUNT, "children"),
     Output(ID.USER_CREDIT_LIMIT_BOX, "children"),
-    Input(ID.USER_ID_SEARCH_INPUT, "value"),
-    Input(ID.CARD_ID_SEARCH_INPUT, "value"),
+    Output(ID.USER_CREDIT_LIMIT_BAR, "figure"),
+    Input(ID.USER_PARSED_IDS_STORE, "data"),
 )
-def update_credit_limit(user_id, card_id):
+def update_user_kpis(parsed_ids):
     """
-    Updates the credit limit information in the user interface based on the provided 
-    user ID or card ID. The function determines the credit limit by querying the 
-    data manager, formats the limit as a text representation, and returns it to the 
-    callback output. If the input values are invalid, missing, or lead to data 
-    retrieval issues, user feedback messages are provided accordingly.
+    Updates all user KPI components based on a given user ID or card ID. The search inputs
+    are parsed in the browser (see parseIds in userTab.js), so this callback only runs when
+    the parsed IDs actually change. They are resolved once and the precomputed KPI row of
+    the user (or card) is fetched once, from which the transaction count, total transaction
+    sum, average transaction amount, card count, credit limit box and credit limit bar are
+    built. The outputs are memoized per resolved ID pair. If no valid user ID or card ID is
+    provided, default values indicating no data or invalid input are returned. In case of an
+    error during the process, invalid KPI values are returned.
 
     Args:
-        user_id (str): The value entered in the user ID search input field. This is 
-            used to fetch the credit limit associated with the specific user.
-        card_id (str): The value entered in the card ID search input field. This is 
-            used to fetch the credit limit associated with the specific card.
+        parsed_ids: The parsed search inputs with the keys "user_id" and "card_id" (each an
+            int, None if the input is empty or "INVALID").
 
     Returns:
-        str: A formatted representation of the credit limit, an error message if the 
-            inputs are invalid or missing, or a message indicating that no data is 
-            available for the specified inputs.
+        A tuple containing, in this order:
+            - Transaction count.
+            - Total transaction sum formatted as currency.
+            - Average transaction amount formatted as currency.
+            - Card count.
+            - Credit limit of the card, or the summed credit limit of the user's cards,
+              formatted as currency.
+            - Figure dict of the stacked credit limit bar of the user's cards.
     """
-    if (user_id is None or str(user_id).strip() == "") and (card_id is None or str(card_id).strip() == ""):
-        return create_kpi_value_text(TEXT_EMPTY_KPI, True)
+    ids = resolve_ids(parsed_ids["user_id"], parsed_ids["card_id"])
+    if ids is None:
+        return KPIS_INVALID + (KPI_TEXT_INVALID, EMPTY_FIGURE)
 
-    try:
-        if card_id is not None and str(card_id).strip() != "":
-            limit = dm.user_tab_data.get_credit_limit(card_id=int(card_id))
-        elif user_id is not None and str(user_id).strip() != "":
-            limit = dm.user_tab_data.get_credit_limit(user_id=int(user_id))
-        else:
-            return create_kpi_value_text("INVALID", True)
-        if limit is None or pd.isna(limit):
-            return create_kpi_value_text("NO DATA", True)
-        return create_kpi_value_text(f"${limit:,.2f}")
-    except Exception as e:
-        print("Error (Credit Limit):", str(e))
-        return create_kpi_value_text("INVALID", True)
+    if ids == (None, None):
+        return KPIS_EMPTY + (KPI_TEXT_EMPTY, EMPTY_FIGURE)
 
+    return _build_user_kpi_outputs(*ids)
 
-@callback(
-    Output(ID.USER_CREDIT_LIMIT_BAR, "figure"),
-    Input(ID.USER_ID_SEARCH_INPUT, "value"),
-    Input(ID.CARD_ID_SEARCH_INPUT, "value"),
-)
-def update_credit_limit_bar(user_id, card_id):
-    """
-    Updates the credit limit bar chart visualization for a user based on the provided
-    user ID or card ID. The function dynamically creates a horizontal stacked bar chart,
-    where each segment represents the credit limit associated with a specific credit card.
-    If no valid inputs are provided, or if the inputs do not correspond to any records,
-    an empty figure is generated and returned.
-
-    :param user_id: A string or integer representing the user identifier. If provided,
-        the function will use the user ID to fetch and process all cards belonging
-        to the given user.
-    :type user_id: str | int
-    :param card_id: A string or integer representing the card identifier. If provided,
-        the function will look up the corresponding user ID and fetch relevant
-        card details for that user.
-    :type card_id: str | int
-    :return: A Plotly figure object representing the credit limit bar chart for the user's
-        cards. If no data is found, an empty figure is returned.
-    :rtype: plotly.graph_objs._figure.Figure
+
+# === Callback: Merchant Bar Chart (bottom) ===
+@lru_cache(maxsize=4096)
+def _build_merchant_figure(user_id: int, sort_by: str, dark_mode: bool) -> dict | None:
     """
-    if card_id is not None and str(card_id).strip() != "":
-        card_df = dm.df_cards[dm.df_cards["id"] == int(card_id)]
-        if card_df.empty:
-            return comp_factory.create_empty_figure()
-        user_id = int(card_df.iloc[0]["client_id"])
-    elif user_id is not None and str(user_id).strip() != "":
-        user_id = int(user_id)
-    else:
-        return comp_factory.create_empty_figure()
-
-    user_cards = dm.df_cards[dm.df_cards["client_id"] == user_id]
-    if user_cards.empty:
-        return comp_factory.create_empty_figure()
-
-    # Nach Kreditlimit sortieren (größte zuerst)
-    user_cards = user_cards.sort_values("credit_limit", ascending=False).reset_index(drop=True)
-    credit_limits = user_cards["credit_limit"].tolist()
-    card_ids = user_cards["id"].tolist()
-
-    # 9 Colors as max num of credit cards is 9
-    colors = [
-        "#36c36a",  # grün
-        "#5d9cf8",  # blau
-        "#f1b44c",  # gelb-orange
-        "#e74c3c",  # rot
-        "#8e44ad",  # lila
-        "#16a085",  # türkis
-        "#f06292",  # pink
-        "#f39c12",  # orange
-        "#7f8c8d",  # grau
-    ]
-
-    fig = go.Figure()
-    for i, (limit, card_id) in enumerate(zip(credit_limits, card_ids)):
-        fig.add_trace(go.Bar(
-            x=[limit],
-            y=["Credit Limit"],
-            name=f"Card {i + 1}",
-            orientation="h",
-            marker_color=colors[i % len(colors)],
-            marker_line_width=0,
-            hovertemplate=(
-                "💳 <b>Card:</b> %{customdata[0]}<br>"
-                "🆔 <b>ID:</b> %{customdata[1]}<br>"
-                "💰 <b>Limit:</b> $%{x:,.2f}<extra></extra>"
-            ),
-            text=f"${limit:,.2f}",
-            textposition="inside",
-            insidetextanchor="middle",
-            textfont=dict(size=14, color="white"),
-            offsetgroup=0,
-            customdata=[[i + 1, card_id]],
-        ))
+    Builds the merchant bar chart of a user for the given sort order and theme.
 
-    fig.update_layout(
-        barmode="stack",
-        showlegend=False,
-        bargap=0,
-        margin=dict(l=0, r=0, t=0, b=0),
-        plot_bgcolor=const.COLOR_TRANSPARENT,
-        paper_bgcolor=const.COLOR_TRANSPARENT,
-        xaxis=dict(
-            showticklabels=False,
-            visible=False,
-            range=[0, sum(credit_limits)]
-        ),
-        yaxis=dict(showticklabels=False, visible=False),
-    )
+    Inputs form a small discrete space (user IDs x sort options x themes), so the
+    result is memoized and returned as a plain figure dict. The returned dict is
+    shared between calls and must not be mutated.
+
+    Args:
+        user_id (int): The resolved user ID.
+        sort_by (str): The selected sort option of the dropdown.
+        dark_mode (bool): Whether the chart should be styled for dark mode.
+
+    Returns:
+        dict | None: The figure dict, or None if the user has no transactions.
+    """
+    # Users without transactions have no aggregation entry, so no separate transaction lookup is needed
+    agg_data = dm.user_tab_data.get_user_merchant_agg(user_id)
+    if agg_data.empty:
+        return None
 
-    return fig
+    # Configure chart parameters and take the user's top merchants from the precomputed row order
+    chart_params = configure_chart_parameters(agg_data, sort_by)
+    top_merchants = dm.user_tab_data.get_user_top_merchants(user_id, chart_params["x_col"], TOP_MERCHANTS_LIMIT)
+    return create_bar_chart_figure(top_merchants, chart_params, dark_mode).to_plotly_json()
 
 
-# === Callback: Merchant Bar Chart (bottom) ===
 @callback(
     Output(ID.USER_MERCHANT_BAR_CHART, "figure"),
     Output(ID.USER_BAR_CHART_SPINNER, "className"),
-    Input(ID.USER_ID_SEARCH_INPUT, "value"),
-    Input(ID.CARD_ID_SEARCH_INPUT, "value"),
+    Output(ID.USER_MERCHANT_BAR_CHART_STATE_STORE, "data"),
+    Input(ID.USER_PARSED_IDS_STORE, "data"),
     Input(ID.USER_MERCHANT_SORT_DROPDOWN, "value"),
-    Input(ID.APP_STATE_STORE, "data")
+    Input(ID.APP_STATE_STORE, "data"),
+    State(ID.USER_MERCHANT_BAR_CHART_STATE_STORE, "data"),
 )
-def update_merchant_bar_chart(user_id, card_id, sort_by, app_state):
+def update_merchant_bar_chart(parsed_ids, sort_by, app_state, rendered_state):
     """
     Updates the merchant bar chart figure based on user input and selected options. The chart reflects aggregated
     transaction data for a specific user, with sorting and display options, optionally including dark mode.
 
     Args:
-        user_id (str or None): The ID of the user whose transaction data is to be displayed. A `None` value indicates
-            no user selection.
-        card_id (str or None): The ID of the card associated with the selected user. A `None` value indicates
-            no specific card selection.
+        parsed_ids (dict): The parsed search inputs with the keys "user_id" (the user whose transaction data is to
+            be displayed) and "card_id" (a card of the user, taking precedence). Each is an int, `None` if the input
+            is empty or "INVALID".
         sort_by (str or None): The sorting criteria for aggregating transaction data. A `None` value uses the default
             sort order.
-        n_clicks_dark (int or None): The number of clicks toggling dark mode. A `None` value or 0 indicates dark
-            mode is disabled.
         app_state (dict): The current application state containing settings like dark_mode.
+        rendered_state (dict or None): The resolved user ID, sort order and dark mode setting the chart was last
+            rendered with.
 
     Returns:
-        plotly.graph_objs._figure.Figure: A figure object representing the merchant bar chart. Returns an empty figure
-            if the user ID is invalid, no transactions exist for the user, or no aggregation data is available.
+        tuple: The figure dict of the merchant bar chart (an empty figure if the user ID is invalid, no
+            transactions exist for the user, or no aggregation data is available), the class name of the
+            spinner and the state the chart is rendered with. If only dark mode was toggled, the figure is a
+            Patch that recolors the rendered chart and the spinner is left unchanged. If only the user changed while
+            a chart is shown, the figure is a Patch that replaces the bars only.
+
+    Raises:
+        PreventUpdate: If the chart is already rendered for the resolved user, sort order and theme, e.g. when
+            a card of the displayed user is searched or the app state changed without toggling dark mode.
     """
     dark_mode = app_state.get("dark_mode", const.DEFAULT_DARK_MODE) if app_state else const.DEFAULT_DARK_MODE
+
+    # Get valid user ID
+    valid_user_id = get_valid_user_id(parsed_ids["user_id"], parsed_ids["card_id"])
+
+    state = {"user_id": valid_user_id, "sort_by": sort_by, "dark_mode": dark_mode}
+    if state == rendered_state:
+        raise PreventUpdate
+
+    # Only the theme changed: recolor the rendered chart instead of re-sending the whole figure
+    if rendered_state is not None and {**rendered_state, "dark_mode": dark_mode} == state:
+        return comp_factory.create_bar_chart_theme_patch(dark_mode), no_update, state
+
     show_spinner_cls = "map-spinner visible"
     hide_spinner_cls = "map-spinner"
 
-    # Get valid user ID
-    try:
-        valid_user_id = get_valid_user_id(user_id, card_id)
-        if valid_user_id is None or str(valid_user_id).strip() == "":
-            return comp_factory.create_empty_figure(), show_spinner_cls
-    except ValueError:
-        return comp_factory.create_empty_figure(), show_spinner_cls
-
-    # Get transaction data
-    df_tx = dm.user_tab_data.get_user_transactions(valid_user_id)
-    if df_tx.empty:
-        return comp_factory.create_empty_figure(), show_spinner_cls
-
-    # Process transaction data
-    agg_data = dm.user_tab_data.get_user_merchant_agg(valid_user_id)
-    if agg_data.empty:
-        return comp_factory.create_empty_figure(), show_spinner_cls
+    if valid_user_id is None:
+        return EMPTY_FIGURE, show_spinner_cls, state
 
-    # Configure chart parameters
-    chart_params = configure_chart_parameters(agg_data, sort_by)
-    return create_bar_chart_figure(agg_data, chart_params, dark_mode), hide_spinner_cls
+    figure = _build_merchant_figure(valid_user_id, sort_by, dark_mode)
+    if figure is None:
+        return EMPTY_FIGURE, show_spinner_cls, state
+
+    # Only the user changed while a chart is shown: the layout only depends on the sort order and theme,
+    # so just the bars are replaced
+    only_user_changed = rendered_state is not None and {**rendered_state, "user_id": valid_user_id} == state
+    if only_user_changed and rendered_state["user_id"] is not None \
+            and _build_merchant_figure(rendered_state["user_id"], sort_by, dark_mode) is not None:
+        return comp_factory.create_figure_data_patch(figure), no_update, state
+
+    return figure, hide_spinner_cls, state
 
 
 @callback(
@@ -309,74 +353,32 @@ def bridge_user_to_merchant_tab(click_data):
         ID.MERCHANT_BTN_INDIVIDUAL_MERCHANT).value
 
 
-@callback(
+# === Clientside Callbacks (assets/js/userTab.js) ===
+# Both only transform the two search input values, so they run in the browser without a server round-trip
+clientside_callback(
+    ClientsideFunction(namespace="user_tab", function_name="toggleInputs"),
     Output(ID.CARD_ID_SEARCH_INPUT, "disabled"),
     Output(ID.CARD_ID_SEARCH_INPUT, "className"),
     Output(ID.USER_ID_SEARCH_INPUT, "disabled"),
     Output(ID.USER_ID_SEARCH_INPUT, "className"),
     Input(ID.USER_ID_SEARCH_INPUT, "value"),
     Input(ID.CARD_ID_SEARCH_INPUT, "value"),
+    State(ID.CARD_ID_SEARCH_INPUT, "disabled"),
+    State(ID.USER_ID_SEARCH_INPUT, "disabled"),
 )
-def toggle_inputs(user_value, card_value):
-    """
-    Toggles the disabled state and CSS class of search input fields based on the input values.
-
-    This function determines whether the "disabled" attribute and CSS class of the input
-    fields for user ID and card ID should be updated based on whether values have been
-    input into the respective fields. When one field is filled, the other becomes disabled
-    and gets an updated CSS class, indicating its disabled state.
-
-    Parameters:
-        user_value (str | None): The current value of the user ID search input.
-        card_value (str | None): The current value of the card ID search input.
-
-    Returns:
-        tuple[bool, str, bool, str]: A tuple containing four values:
-            1. Boolean indicating whether the card ID search input should be disabled.
-            2. String representing the updated CSS class for the card ID search input.
-            3. Boolean indicating whether the user ID search input should be disabled.
-            4. String representing the updated CSS class for the user ID search input.
-    """
-    base_class = "search-bar-input no-spinner"
-
-    user_filled = user_value is not None and str(user_value).strip() != ""
-    card_filled = card_value is not None and str(card_value).strip() != ""
 
-    card_disabled = user_filled
-    user_disabled = card_filled
-
-    card_class = f"{base_class} is-disabled" if card_disabled else base_class
-    user_class = f"{base_class} is-disabled" if user_disabled else base_class
-    return card_disabled, card_class, user_disabled, user_class
-
-
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="user_tab", function_name="updateTabHeading"),
     Output(ID.USER_TAB_HEADING, "children"),
     Input(ID.USER_ID_SEARCH_INPUT, "value"),
     Input(ID.CARD_ID_SEARCH_INPUT, "value"),
+    State(ID.USER_TAB_HEADING, "children"),
 )
-def update_tab_heading(user_id, card_id):
-    """
-    Updates the tab heading dynamically based on user or card IDs.
-
-    This callback function modifies the content of a user tab heading
-    based on the provided `user_id` or `card_id` values. It determines
-    which identifier is present and returns a corresponding label.
-    If both identifiers are empty or invalid, it defaults to a generic
-    "User" label.
 
-    Args:
-        user_id: The ID of the user to be displayed in the tab heading.
-        card_id: The ID of the card to be displayed in the tab heading.
-
-    Returns:
-        str: A formatted string representing the tab heading that uses
-        the provided user or card ID. Defaults to "User" if neither
-        identifier is valid.
-    """
-    if card_id is not None and str(card_id).strip() != "":
-        return f"Card-ID: {card_id}"
-    elif user_id is not None and str(user_id).strip() != "":
-        return f"User-ID: {user_id}"
-    else:
-        return "User"
+clientside_callback(
+    ClientsideFunction(namespace="user_tab", function_name="parseIds"),
+    Output(ID.USER_PARSED_IDS_STORE, "data"),
+    Input(ID.USER_ID_SEARCH_INPUT, "value"),
+    Input(ID.CARD_ID_SEARCH_INPUT, "value"),
+    State(ID.USER_PARSED_IDS_STORE, "data"),
+)
@@ -1,33 +1,46 @@
-import json
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+import orjson
 import pandas as pd
-from pyarrow.parquet import ParquetFile
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+from pyarrow.parquet import ParquetFile, read_metadata, read_table, write_table
 
 import utils.logger as logger
-from components.constants import DATA_DIRECTORY, CACHE_DIRECTORY
+from components.constants import DATA_DIRECTORY, CACHE_DIRECTORY, PARQUET_WRITE_OPTIONS
 from utils.benchmark import Benchmark
 
 merchant_other_threshold = 1000  # Default value, will be modified in set_minor_merchants_threshold
+UNIT_SAMPLE_SIZE = 1024  # Rows checked by clean_units before a column is checked as a whole
+PARQUET_MEMORY_MAP_MAX_SIZE = 128 << 20  # Larger Parquet files are read with regular file reads instead of mmap
+PARQUET_LOW_MEMORY_BUFFER_SIZE = 8 << 20  # Read buffer per column chunk for low_memory Parquet reads (8 MiB)
 
 
-def read_parquet_data(file_name: str, sort_alphabetically: bool = False, num_rows: int = None) -> pd.DataFrame:
+def read_parquet_data(file_name: str, sort_alphabetically: bool = False, num_rows: int = None,
+                      columns: list[str] | None = None, low_memory: bool = False) -> pd.DataFrame:
     """
     Reads a parquet file and returns its content as a pandas DataFrame. The function provides
     an option to sort the DataFrame's columns alphabetically.
 
 
     This function enables efficient reading of Parquet files by leveraging multi-threading,
-    memory mapping, and optimized settings. It optionally sorts the DataFrame's columns 
-    alphabetically and sets the threshold for minor merchant groupings when specific criteria are met.
-    It can also limit the number of rows read from the file.
+    memory mapping (for files up to PARQUET_MEMORY_MAP_MAX_SIZE), and optimized settings. It optionally
+    sorts the DataFrame's columns alphabetically and sets the threshold for minor merchant groupings
+    when specific criteria are met.
+    It can also limit the number of rows read from the file and read only a subset of its
+    columns, in which case the other columns are not read from disk at all.
 
     Args:
         file_name: The name of the Parquet file to be read.
         sort_alphabetically: A flag to indicate whether the DataFrame's columns should
             be sorted alphabetically.
         num_rows: The maximum number of rows to read from the file. If None, all rows are read.
+        columns: The names of the columns to read. If None, all columns are read.
+        low_memory: Whether to read through buffered streams instead of loading whole column
+            chunks into memory (see read_parquet_file).
 
 
     Returns:
@@ -44,17 +57,8 @@ def read_parquet_data(file_name: str, sort_alphabetically: bool = False, num_row
     if not file_path.exists():
         raise FileNotFoundError(f"⚠️ Parquet file not found: {file_path}")
 
-    # Read rows with optimized settings
-    df = pd.read_parquet(
-        file_path,
-        engine="pyarrow",
-        use_threads=True,  # Enable multi-threading
-        memory_map=True  # Use memory mapping for better performance
-    )
-
-    # Limit the number of rows if specified
-    if num_rows is not None:
-        df = df.head(num_rows)
+    # Read rows with optimized settings (only the first num_rows rows / the given columns are decoded if specified)
+    df = read_parquet_file(file_path, num_rows=num_rows, columns=columns, low_memory=low_memory)
 
     if sort_alphabetically:
         # Use inplace sorting if possible to avoid copying the entire dataframe
@@ -63,12 +67,68 @@ def read_parquet_data(file_name: str, sort_alphabetically: bool = False, num_row
     return df
 
 
+def read_parquet_file(file_path: Path | str, num_rows: int = None, columns: list[str] | None = None,
+                      low_memory: bool = False) -> pd.DataFrame:
+    """
+    Reads a Parquet file into a pandas DataFrame through an Arrow table.
+
+    Files up to PARQUET_MEMORY_MAP_MAX_SIZE are memory-mapped, which is slightly faster to read.
+    Larger files (e.g. the transactions) are read with regular file reads instead, because every
+    touched page of a mapping counts towards the resident memory of the process, which adds up when
+    several workers share the data. The file is decoded with multiple threads. The Arrow table is converted
+    with split_blocks and self_destruct, so each column is handed over to pandas on its own and
+    the Arrow buffers are released during the conversion instead of keeping both copies alive,
+    which keeps the peak memory of large caches (e.g. the transactions) low.
+
+    If num_rows is given, only the first batch of that many rows is decoded instead of reading
+    the whole file and cutting the DataFrame afterwards. If columns is given, only these columns
+    (plus a stored pandas index, like pd.read_parquet) are read.
+
+    By default, the column chunks are pre-buffered (read in full before decoding), which is the
+    fastest option. With low_memory, they are instead read through buffered streams of
+    PARQUET_LOW_MEMORY_BUFFER_SIZE bytes, so large row groups are never held serialized in memory
+    as a whole. This lowers the peak memory at the cost of more, smaller reads.
+
+    Args:
+        file_path: Path of the Parquet file to read.
+        num_rows: The maximum number of rows to read. If None, all rows are read.
+        columns: The names of the columns to read. If None, all columns are read.
+        low_memory: Whether to read through buffered streams instead of pre-buffering.
+
+    Returns:
+        A pandas DataFrame containing the content of the Parquet file.
+    """
+    memory_map = Path(file_path).stat().st_size <= PARQUET_MEMORY_MAP_MAX_SIZE
+    buffer_options = {"pre_buffer": not low_memory, "buffer_size": PARQUET_LOW_MEMORY_BUFFER_SIZE if low_memory else 0}
+
+    if num_rows is None:
+        table = read_table(
+            file_path, columns=columns, memory_map=memory_map, use_threads=True, use_pandas_metadata=True,
+            **buffer_options
+        )
+    else:
+        parquet_file = ParquetFile(file_path, memory_map=memory_map, **buffer_options)
+        batches = parquet_file.iter_batches(
+            batch_size=max(num_rows, 1), columns=columns, use_threads=True, use_pandas_metadata=True
+        )
+        first_batch = next(batches, None)
+        if first_batch is not None:
+            table = pa.Table.from_batches([first_batch]).slice(0, num_rows)
+        else:
+            # Empty file: Build the (projected) empty table from the schema
+            table = parquet_file.schema_arrow.empty_table()
+            if columns is not None:
+                table = table.select(columns)
+
+    # The table is consumed by the conversion, so no other reference to it may be kept
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
 def set_minor_merchants_threshold(file_path: Path):
     global merchant_other_threshold
 
-    # Get total number of rows in the file
-    pf = ParquetFile(file_path)
-    total_rows = pf.metadata.num_rows
+    # Get total number of rows in the file (only the footer is read)
+    total_rows = read_metadata(file_path).num_rows
     merchant_other_threshold = total_rows / 50  # based on testing with 50_000 rows and threshold = 1000
 
 
@@ -78,6 +138,10 @@ def optimize_data(*file_names: str):
     efficiency. If a corresponding Parquet file already exists, it will be used directly instead of
     reloading and converting the CSV file.
 
+    The CSV is parsed with PyArrow's multithreaded reader and written to Parquet directly from the Arrow
+    table, without a pandas round trip. Columns that PyArrow would infer as dates/timestamps are kept as
+    text and empty strings become nulls, so the resulting Parquet file matches what pandas' read_csv produced.
+
     Args:
         file_names (str): Name of the input CSV file to be processed.
 
@@ -99,25 +163,75 @@ def optimize_data(*file_names: str):
             logger.log(f"🔄 Converting CSV to Parquet: {csv_path}", 3)
             bm = Benchmark("Conversion")
 
-            # Read CSV into DataFrame
-            df = pd.read_csv(csv_path)
-            # Write Parquet with fast encoding
-            df.to_parquet(
-                parquet_path,
-                engine='pyarrow',
-                compression='snappy',
+            # Infer the column types from the first block only to keep date/time columns as text (like pandas)
+            with pa_csv.open_csv(csv_path) as reader:
+                inferred_schema = reader.schema
+            text_columns = {
+                field.name: pa.string() for field in inferred_schema
+                if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type)
+            }
+
+            # Read CSV into an Arrow table using all cores
+            table = pa_csv.read_csv(
+                csv_path,
+                read_options=pa_csv.ReadOptions(use_threads=True),
+                convert_options=pa_csv.ConvertOptions(column_types=text_columns, strings_can_be_null=True)
             )
+            # Write Parquet with dictionary encoding and zstd compression
+            write_table(table, parquet_path, **PARQUET_WRITE_OPTIONS)
             logger.log(f"✅ Saved Parquet: {parquet_path}", 4)
             bm.print_time(level=4)
 
 
+def _to_arrow_strings(column: pd.Series) -> pa.Array | None:
+    """
+    Converts an object column into an Arrow string array (None/NaN become nulls), or returns None
+    if the column holds values other than strings.
+    """
+    try:
+        return pa.array(column, from_pandas=True, type=pa.large_string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _strip_unit_and_convert(values: pa.Array, column: pd.Series) -> pd.Series:
+    """
+    Removes the leading unit symbol of an Arrow string array and converts it into numbers.
+
+    The values are cast to int64 and, if that fails, to float64 in Arrow, so the resulting
+    dtypes match pd.to_numeric (int64 for whole numbers without nulls, float64 otherwise).
+    Values Arrow cannot parse fall back to pd.to_numeric, which coerces them to NaN.
+
+    Args:
+        values (pa.Array): The column as an Arrow string array.
+        column (pd.Series): The original column, providing the index and the name.
+
+    Returns:
+        pd.Series: The numeric column.
+    """
+    text = pc.utf8_slice_codeunits(values, 1)
+
+    for target_type in (pa.int64(), pa.float64()):
+        try:
+            numbers = pc.cast(text, target_type)
+        except pa.ArrowInvalid:
+            continue
+        if numbers.null_count and pa.types.is_integer(target_type):
+            numbers = pc.cast(numbers, pa.float64())
+        return pd.Series(numbers.to_numpy(zero_copy_only=False), index=column.index, name=column.name)
+
+    return pd.to_numeric(column.str[1:], errors="coerce")
+
+
 def clean_units(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans monetary unit symbols from the columns of a DataFrame.
 
     This function processes the columns of the input DataFrame and removes dollar
     signs from cell values, converting them into numeric values where applicable.
-    Only columns where all non-empty cells start with a dollar sign are cleaned.
+    Only columns where all non-empty cells start with a dollar sign are cleaned. The first
+    UNIT_SAMPLE_SIZE rows are checked first, so most text columns are rejected early; a
+    column passing this sample is still checked completely before it is converted.
     Any column not matching these criteria remains unchanged. Cells are coerced
     to numeric types during processing.
 
@@ -128,29 +242,184 @@ def clean_units(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: A new DataFrame with monetary symbols removed and converted
         to numeric values where applicable.
     """
-    # First identify which columns need cleaning
-    columns_to_clean = []
+    cleaned_columns = {}
+
+    # Only string-like columns can hold unit symbols, numeric columns are skipped without any scan
+    for col in df.select_dtypes(include="object").columns:
+        # Cheap pre-check on the first rows, so plain text columns are rejected without converting them as a whole
+        sample = _to_arrow_strings(df[col].iloc[:UNIT_SAMPLE_SIZE])
+        if sample is None or pc.all(pc.starts_with(sample, "$")).as_py() is False:
+            continue
 
-    for col in df.columns:
-        # Only check string-like columns to avoid unnecessary conversions
-        if pd.api.types.is_object_dtype(df[col]):
-            sample_values = df[col].dropna()
-            if not sample_values.empty and sample_values.astype(str).str.startswith("$").all():
-                columns_to_clean.append(col)
+        # Convert the whole column to an Arrow string array once; columns holding non-strings are left unchanged
+        values = _to_arrow_strings(df[col])
+        if values is None:
+            continue
+
+        # The prefix check runs in Arrow's string kernels (nulls are skipped, an all-null column yields None)
+        if not pc.all(pc.starts_with(values, "$")).as_py():
+            continue
+        cleaned_columns[col] = _strip_unit_and_convert(values, df[col])
 
     # If no columns need cleaning, return the original dataframe
-    if not columns_to_clean:
+    if not cleaned_columns:
         return df
 
-    # Only create a copy if we need to modify the dataframe
-    new_df = df.copy()
+    # Only the cleaned columns are replaced, the others are shared with the input instead of copied
+    return df.assign(**cleaned_columns)
+
+
+def downcast_numeric_columns(df: pd.DataFrame, columns: tuple[str, ...], int_dtype=np.int32) -> pd.DataFrame:
+    """
+    Downcasts numeric columns of a DataFrame to 32 bit (or smaller) where this is lossless.
+
+    Key columns such as client, card and merchant IDs or MCCs comfortably fit into
+    32 bits, so storing them as 64 bit values only doubles the memory and the bytes
+    that groupby and merge operations have to move. Integer columns are converted to
+    int_dtype if all values are within its range; float columns are converted to float32
+    only if every value survives the round trip unchanged (e.g. whole-dollar amounts).
+    Columns that are missing, not numeric or would lose information are left unchanged.
+
+    Args:
+        df (pd.DataFrame): The DataFrame whose columns should be downcast (modified in place).
+        columns (tuple[str, ...]): The names of the columns to downcast.
+        int_dtype: The integer dtype to downcast integer columns to. Defaults to np.int32;
+            pass e.g. np.int16 for short codes such as MCCs.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with the downcast columns.
+    """
+    int_info = np.iinfo(int_dtype)
+
+    for col in columns:
+        if col not in df.columns or df[col].dtype in (int_info.dtype, np.float32):
+            continue
+
+        if pd.api.types.is_integer_dtype(df[col]):
+            if df[col].empty or (df[col].min() >= int_info.min and df[col].max() <= int_info.max):
+                df[col] = df[col].astype(int_dtype)
+
+        elif pd.api.types.is_float_dtype(df[col]):
+            values = df[col].to_numpy()
+            as_float32 = values.astype(np.float32)
+            if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+                df[col] = as_float32
+
+    return df
+
+
+def convert_to_arrow_strings(df: pd.DataFrame, columns: tuple[str, ...]) -> pd.DataFrame:
+    """
+    Converts text columns of a DataFrame to the PyArrow-backed string dtype.
+
+    Arrow strings are stored in one contiguous buffer instead of one Python object per
+    cell, which saves memory and lets comparisons, filters and groupby operations on
+    these columns run in Arrow's vectorized kernels. Missing values become pd.NA.
+    Columns that are missing or not of object dtype are left unchanged.
+
+    Args:
+        df (pd.DataFrame): The DataFrame whose columns should be converted (modified in place).
+        columns (tuple[str, ...]): The names of the text columns to convert.
+
+    Returns:
+        pd.DataFrame: The same DataFrame with the converted columns.
+    """
+    for col in columns:
+        if col in df.columns and pd.api.types.is_object_dtype(df[col]):
+            df[col] = df[col].astype("string[pyarrow]")
+
+    return df
+
+
+def _aggregate_count_sum_groupby(df: pd.DataFrame, keys: list[str], value_col: str, count_name: str,
+                                 sum_name: str) -> pd.DataFrame:
+    """
+    Regular pandas groupby implementation of aggregate_count_sum, used for keys that cannot be packed.
+    """
+    return df.groupby(keys, observed=True, as_index=False).agg(
+        **{count_name: (value_col, "size"), sum_name: (value_col, "sum")}
+    )
+
+
+def aggregate_count_sum(df: pd.DataFrame, keys: list[str], value_col: str, count_name: str,
+                        sum_name: str) -> pd.DataFrame:
+    """
+    Counts the rows and sums a value column per group of integer key columns.
+
+    This is a faster replacement for ``df.groupby(keys, as_index=False).agg(...)`` with a
+    size and a sum aggregation. The key columns are packed into a single int64 key, so a
+    single argsort brings each group's rows together and ``np.add.reduceat`` sums all
+    groups in one vectorized pass over contiguous memory. Like the groupby, the result is
+    sorted by the keys and missing values are ignored in the sum (but counted). If a key
+    column is not of integer dtype or the packed key would overflow, the regular pandas
+    groupby is used instead.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to aggregate.
+        keys (list[str]): The names of the integer key columns to group by.
+        value_col (str): The name of the column whose values are summed.
+        count_name (str): The name of the row count column in the result.
+        sum_name (str): The name of the sum column in the result.
+
+    Returns:
+        pd.DataFrame: One row per group with the key columns, the row count (int64) and
+            the sum (float64).
+    """
+    # Only non-empty integer keys without missing values can be packed (float keys may hold NaN,
+    # strings/categories have no numeric range)
+    if df.empty or not all(pd.api.types.is_integer_dtype(df[key]) and not df[key].hasnans for key in keys):
+        return _aggregate_count_sum_groupby(df, keys, value_col, count_name, sum_name)
 
-    # Process only the columns that need cleaning
-    for col in columns_to_clean:
-        # Process in a single step to avoid intermediate copies
-        new_df[col] = pd.to_numeric(df[col].astype(str).str[1:], errors="coerce")
+    key_values = [df[key].to_numpy() for key in keys]
+    spans = [int(values.max()) - int(values.min()) + 1 for values in key_values]
 
-    return new_df
+    # The packed key must fit into int64
+    if np.prod(spans, dtype=np.float64) >= np.iinfo(np.int64).max:
+        return _aggregate_count_sum_groupby(df, keys, value_col, count_name, sum_name)
+
+    # Pack all key columns into one int64 key (mixed radix, first key most significant)
+    packed = np.zeros(len(df), dtype=np.int64)
+    for values, span in zip(key_values, spans):
+        packed *= span
+        packed += values.astype(np.int64) - values.min()
+
+    order = np.argsort(packed, kind="stable")
+    packed = packed[order]
+
+    # A new group starts wherever the packed key changes
+    is_start = np.empty(len(packed), dtype=bool)
+    is_start[0] = True
+    np.not_equal(packed[1:], packed[:-1], out=is_start[1:])
+    starts = np.flatnonzero(is_start)
+
+    values = np.nan_to_num(df[value_col].to_numpy(dtype=np.float64)[order], nan=0.0)
+
+    result = {key: values_of_key[order[starts]] for key, values_of_key in zip(keys, key_values)}
+    result[count_name] = np.diff(np.append(starts, len(packed))).astype(np.int64)
+    result[sum_name] = np.add.reduceat(values, starts)
+    return pd.DataFrame(result)
+
+
+def _flatten_record(record: dict, prefix: str = "", flat: dict = None) -> dict:
+    """
+    Flattens a nested JSON record into a single level dict with "a.b.c" keys, like pd.json_normalize.
+
+    The keys are ordered like pd.json_normalize orders them (plain values first, then the flattened
+    nested objects), but the record is walked once without json_normalize's deep copy of every record.
+    """
+    flat = {} if flat is None else flat
+    nested = []
+
+    for key, value in record.items():
+        key = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            nested.append((key, value))
+        else:
+            flat[key] = value
+
+    for key, value in nested:
+        _flatten_record(value, key, flat)
+    return flat
 
 
 def json_to_data_frame(file_name: str) -> pd.DataFrame:
@@ -158,7 +427,8 @@ def json_to_data_frame(file_name: str) -> pd.DataFrame:
     Converts a JSON file into a Pandas DataFrame.
 
     The function reads a JSON file from the specified data directory,
-    loads its content, and converts it into a Pandas DataFrame using the `pd.json_normalize` method.
+    loads its content with orjson, and converts it into a Pandas DataFrame. Lists of records are flattened
+    in one pass with the same column naming as `pd.json_normalize`, other structures use `pd.json_normalize`.
     This is particularly useful for working with nested JSON structures and transforming them into
     a tabular format.
 
@@ -180,10 +450,13 @@ def json_to_data_frame(file_name: str) -> pd.DataFrame:
 
     logger.log(f"🔄 Converting JSON to DataFrame: {json_path}", 2)
     bm = Benchmark("Conversion")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = orjson.loads(json_path.read_bytes())
 
-    df = pd.json_normalize(data)
+    # Lists of records are flattened in one pass, anything else is left to pandas
+    if isinstance(data, list) and all(isinstance(record, dict) for record in data):
+        df = pd.DataFrame([_flatten_record(record) for record in data])
+    else:
+        df = pd.json_normalize(data)
     bm.print_time(level=3)
 
     return df
@@ -220,34 +493,7 @@ def json_to_df(file_name: str, col_names: list) -> Any:
     if not json_path.exists():
         raise FileNotFoundError(f"⚠️ JSON file not found: {json_path}")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = orjson.loads(json_path.read_bytes())
 
     items = list(data.items())
     return pd.DataFrame(items, columns=col_names)
-
-
-def get_mcc_description_by_merchant_id(df_mcc: pd.DataFrame, merchant_id: int | str) -> str:
-    """
-    Fetch the Merchant Category Code (MCC) description associated with a given merchant ID from a DataFrame.
-    If the merchant ID is invalid or not found in the DataFrame, returns "Undefined".
-
-    Args:
-        df_mcc (pd.DataFrame): A DataFrame with 'mcc' and 'merchant_group' columns.
-        merchant_id (int | str): The merchant ID to lookup in the DataFrame.
-
-    Returns:
-        str: The MCC description associated with the given merchant ID, or "Undefined" if the ID is invalid or not found.
-    """
-    # Normalize merchant_id: Int->Str
-    try:
-        mcc_id = int(merchant_id)
-    except (ValueError, TypeError):
-        return "Undefined"
-
-    # Lookup in DataFrame
-    result = df_mcc[df_mcc['mcc'] == mcc_id]
-    if len(result) > 0:
-        return result.iloc[0]['merchant_group']
-    else:
-        return "Undefined"
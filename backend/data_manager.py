@@ -3,19 +3,20 @@ import pickle
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import pgeocode
 import us
 
 import utils.logger as logger
 from backend.data_cacher import DataCacher
-from backend.data_handler import optimize_data, clean_units, json_to_df, \
-    read_parquet_data, set_minor_merchants_threshold
+from backend.data_handler import optimize_data, clean_units, json_to_df, read_parquet_data, read_parquet_file, \
+    set_minor_merchants_threshold, downcast_numeric_columns, convert_to_arrow_strings
 from backend.data_setup.tabs.tab_cluster_data import ClusterTabData
 from backend.data_setup.tabs.tab_home_data import HomeTabData
 from backend.data_setup.tabs.tab_merchant_data import MerchantTabData
 from backend.data_setup.tabs.tab_user_data import UserTabData
-from components.constants import DATA_DIRECTORY, CACHE_DIRECTORY
+from components.constants import DATA_DIRECTORY, CACHE_DIRECTORY, PARQUET_WRITE_OPTIONS
 from utils.benchmark import Benchmark
 from utils.utils import rounded_rect
 
@@ -81,7 +82,10 @@ class DataManager:
         self.df_users: pd.DataFrame = pd.DataFrame()
         self.df_transactions: pd.DataFrame = pd.DataFrame()
         self.df_cards: pd.DataFrame = pd.DataFrame()
+        self.df_cards_by_id: pd.DataFrame = pd.DataFrame()  # df_cards indexed by card ID for O(1) lookups
         self.df_mcc: pd.DataFrame = json_to_df("mcc_codes.json", col_names=["mcc", "merchant_group"])
+        self.mcc_desc_by_code: dict[int, str] = {}  # mcc -> merchant_group, built once in load_data_frames
+        self.mcc_desc_lookup: np.ndarray = np.empty(0, dtype=object)  # merchant_group indexed by mcc
         self.df_train_fraud: pd.DataFrame = pd.DataFrame()
         self.transactions_mcc: pd.DataFrame = pd.DataFrame()
         self.transactions_mcc_users: pd.DataFrame = pd.DataFrame()
@@ -162,7 +166,7 @@ class DataManager:
 
         if users_processed_path.exists():
             logger.log(f"ℹ️ Loading processed users data from cache: {users_processed_path}", 3)
-            self.df_users = pd.read_parquet(users_processed_path)
+            self.df_users = read_parquet_file(users_processed_path)
 
             if users_to_del_path.exists():
                 os.remove(users_to_del_path)
@@ -183,7 +187,7 @@ class DataManager:
 
         if transactions_processed_path.exists():
             logger.log(f"ℹ️ Loading processed transactions data from cache: {transactions_processed_path}", 3)
-            self.df_transactions = pd.read_parquet(transactions_processed_path)
+            self.df_transactions = read_parquet_file(transactions_processed_path)
 
             if transactions_to_del_path.exists():
                 os.remove(transactions_to_del_path)
@@ -208,7 +212,7 @@ class DataManager:
 
         if cards_processed_path.exists():
             logger.log(f"ℹ️ Loading processed cards data from cache: {cards_processed_path}", 3)
-            self.df_cards = pd.read_parquet(cards_processed_path)
+            self.df_cards = read_parquet_file(cards_processed_path)
 
             if cards_to_del_path.exists():
                 os.remove(cards_to_del_path)
@@ -220,8 +224,28 @@ class DataManager:
             self.df_cards = clean_units(read_parquet_data("cards_data.parquet"))
             self.save_cache_to_disk("cards_data_processed", self.df_cards)
 
+        # Halve the memory of the integer key columns and of the credit limits (if lossless); transaction
+        # amounts stay float64 for exact global sums. MCCs are 4-digit codes and fit into 16 bits
+        downcast_numeric_columns(self.df_users, ("id",))
+        downcast_numeric_columns(self.df_transactions, ("client_id", "card_id", "merchant_id"))
+        downcast_numeric_columns(self.df_transactions, ("mcc",), int_dtype=np.int16)
+        downcast_numeric_columns(self.df_cards, ("id", "client_id", "credit_limit"))
+        self.df_cards_by_id = self.df_cards.set_index("id")
+
+        # Text columns of the transactions used in filters and groupbys are kept as Arrow strings
+        convert_to_arrow_strings(
+            self.df_transactions, ("use_chip", "merchant_city", "merchant_state", "errors", "state_name")
+        )
+
         # Convert to int once
         self.df_mcc["mcc"] = self.df_mcc["mcc"].astype(int)
+        self.mcc_desc_by_code = dict(zip(self.df_mcc["mcc"].tolist(), self.df_mcc["merchant_group"].tolist()))
+
+        # Dense code -> description array (MCCs are 4-digit codes), so whole columns of codes can be
+        # labeled with one fancy index instead of a hash lookup per row
+        mcc_codes = self.df_mcc["mcc"].to_numpy()
+        self.mcc_desc_lookup = np.full(mcc_codes.max() + 1 if len(mcc_codes) else 0, None, dtype=object)
+        self.mcc_desc_lookup[mcc_codes] = self.df_mcc["merchant_group"].to_numpy()
 
         bm.print_time(level=4, add_empty_line=True)
 
@@ -238,7 +262,7 @@ class DataManager:
 
             if isinstance(data, pd.DataFrame):
                 # Save DataFrame as parquet
-                data.to_parquet(f"{cache_path}.parquet", index=False)
+                data.to_parquet(f"{cache_path}.parquet", index=False, **PARQUET_WRITE_OPTIONS)
                 logger.log(f"✅ Saved DataFrame cache to {cache_path}.parquet", indent_level=3)
             else:
                 # Save other objects using pickle
@@ -266,7 +290,7 @@ class DataManager:
             if is_dataframe:
                 cache_path = self.cache_dir / f"{cache_name}.parquet"
                 if cache_path.exists():
-                    data = pd.read_parquet(cache_path)
+                    data = read_parquet_file(cache_path)
                     logger.log(f"✅ Loaded DataFrame cache from {cache_path}", indent_level=3)
                     return data
             else:
@@ -316,8 +340,8 @@ class DataManager:
             df.to_parquet(
                 CACHE_DIRECTORY / "transactions_data.parquet",
                 engine="pyarrow",
-                compression="snappy",
-                index=False
+                index=False,
+                **PARQUET_WRITE_OPTIONS
             )
 
             bm.print_time(level=3)
@@ -346,8 +370,8 @@ class DataManager:
             df.to_parquet(
                 CACHE_DIRECTORY / "transactions_data.parquet",
                 engine="pyarrow",
-                compression="snappy",
-                index=False
+                index=False,
+                **PARQUET_WRITE_OPTIONS
             )
 
             bm.print_time(level=3)
@@ -480,7 +504,10 @@ class DataManager:
         paths_to_delete = (
             self.cache_dir / "users_data.parquet",
             self.cache_dir / "transactions_data.parquet",
-            self.cache_dir / "cards_data.parquet"
+            self.cache_dir / "cards_data.parquet",
+            # User tab caches in the old per-user layout, superseded by the *_sorted_df caches
+            self.cache_dir / "user_transactions_df.parquet",
+            self.cache_dir / "user_merchant_agg_df.parquet"
         )
 
         for path in paths_to_delete:
@@ -2,7 +2,6 @@ from typing import Optional, Callable, Any
 
 import pandas as pd
 
-from backend.data_handler import get_mcc_description_by_merchant_id
 from backend.kpi_models import MerchantKPI, PeakHourKPI, UserKPI, VisitKPI
 from utils import logger
 from utils.benchmark import Benchmark
@@ -64,12 +63,8 @@ class HomeTabData:
             .sort_values("merchant_sum", ascending=False)
         )
 
-        # Pre-compute MCC descriptions for all unique MCCs
-        unique_mccs = df_sums['mcc'].unique()
-        mcc_desc_map = {mcc: get_mcc_description_by_merchant_id(self.df_mcc, int(mcc)) for mcc in unique_mccs}
-
-        # Use vectorized mapping instead of apply
-        df_sums["mcc_desc"] = df_sums["mcc"].map(mcc_desc_map)
+        # Map the MCC descriptions with the DataManager's code -> description dict in one vectorized pass
+        df_sums["mcc_desc"] = df_sums["mcc"].map(self.data_manager.mcc_desc_by_code).fillna("Undefined")
 
         self._cache_most_valuable_merchant[state] = df_sums
         return df_sums
@@ -98,7 +93,7 @@ class HomeTabData:
         return MerchantKPI(
             id=int(top["merchant_id"]),
             mcc=int(top["mcc"]),
-            mcc_desc=get_mcc_description_by_merchant_id(self.df_mcc, int(top["mcc"])),
+            mcc_desc=top["mcc_desc"],
             value=f"{float(top['merchant_sum']):,.2f}"
         )
 
@@ -286,10 +281,6 @@ class HomeTabData:
         merchant_mcc_map = df[['merchant_id', 'mcc']].drop_duplicates('merchant_id').set_index('merchant_id')[
             'mcc'].to_dict()
 
-        # Pre-compute MCC descriptions for all unique MCCs
-        unique_mccs = set(merchant_mcc_map.values())
-        mcc_desc_map = {mcc: get_mcc_description_by_merchant_id(self.df_mcc, mcc) for mcc in unique_mccs}
-
         # Aggregate visits by merchant more efficiently
         visit_counts = (
             df.groupby("merchant_id", sort=False)
@@ -300,7 +291,7 @@ class HomeTabData:
 
         # Use vectorized operations instead of apply
         visit_counts['mcc'] = visit_counts['merchant_id'].map(merchant_mcc_map)
-        visit_counts['mcc_desc'] = visit_counts['mcc'].map(mcc_desc_map)
+        visit_counts['mcc_desc'] = visit_counts['mcc'].map(self.data_manager.mcc_desc_by_code).fillna("Undefined")
 
         self._cache_visits_by_merchant[state] = visit_counts
         return visit_counts
@@ -1,159 +1,277 @@
+import numpy as np
 import pandas as pd
 
-from backend.data_handler import get_mcc_description_by_merchant_id
+from backend.data_handler import aggregate_count_sum
 from utils import logger
 from utils.benchmark import Benchmark
 
+MERCHANT_AGG_SORT_COLUMNS = ("tx_count", "total_sum")  # Columns the merchant bar chart can be sorted by
+
 
 class UserTabData:
     def __init__(self, data_manager):
         self.data_manager = data_manager
 
         # Caches
-        self._cache_user_transactions: dict[int, pd.DataFrame] = {}  # user_id -> DataFrame
-        self._cache_user_merchant_agg: dict[int, pd.DataFrame] = {}  # user_id -> Aggregated DataFrame
+        self._cache_user_transactions: pd.DataFrame = pd.DataFrame()  # All transactions, sorted by client_id
+        self._user_transaction_offsets: dict[int, tuple[int, int]] = {}  # user_id -> (start, end) row range
+        self._cache_user_merchant_agg: pd.DataFrame = pd.DataFrame()  # Aggregation of all users, sorted by client_id
+        self._user_merchant_agg_offsets: dict[int, tuple[int, int]] = {}  # user_id -> (start, end) row range
+        self._user_merchant_agg_orders: dict[str, np.ndarray] = {}  # sort column -> per-user descending row order
+
+        # KPI tables (struct of arrays, one row per user / card)
+        self._kpi_row_by_user: dict[int, int] = {}  # user_id -> row in the user KPI arrays
+        self._kpi_user_ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self._kpi_tx_count: np.ndarray = np.empty(0, dtype=np.int64)
+        self._kpi_total_sum: np.ndarray = np.empty(0, dtype=np.float64)
+        self._kpi_average_amount: np.ndarray = np.empty(0, dtype=np.float64)
+        self._kpi_card_count: np.ndarray = np.empty(0, dtype=np.int64)
+        self._kpi_credit_limit: np.ndarray = np.empty(0, dtype=np.float64)
+        self._kpi_row_by_card: dict[int, int] = {}  # card_id -> row in the card KPI arrays
+        self._kpi_card_user_row: np.ndarray = np.empty(0, dtype=np.int64)
+        self._kpi_card_credit_limit: np.ndarray = np.empty(0, dtype=np.float64)
+        self._card_limits_by_user: dict[int, tuple[np.ndarray, np.ndarray]] = {}  # user_id -> (limits, card IDs)
         self.unique_user_ids = set(data_manager.df_users["id"].unique())
         self.unique_card_ids = set(data_manager.df_cards["id"].unique())
 
     def cache_user_transactions(self):
         """
-        Caches user transactions by grouping them by client ID.
+        Caches user transactions sorted by client ID together with per-user row offsets.
 
-        This method processes the transactions DataFrame (df_transactions) by grouping
-        transactions based on the "client_id" column. For each unique client ID, it
-        creates a reference to the corresponding subset of the DataFrame and stores it in
-        a dictionary. The dictionary is stored as an internal attribute
-        (_cache_user_transactions), where the keys represent client IDs and the values
-        are the dataframes containing transactions for each user.
+        This method sorts the transactions DataFrame (df_transactions) once by the
+        "client_id" column (stable, so each user's transactions keep their original
+        order) and stores it as an internal attribute (_cache_user_transactions). For
+        each client ID, the start and end row of its contiguous block are recorded in
+        _user_transaction_offsets, so a user's transactions can later be sliced out
+        without filtering or copying the whole DataFrame.
 
         Raises:
             KeyError: If the DataFrame does not contain a "client_id" column.
             AttributeError: If df_transactions is not a valid DataFrame object.
         """
-        # Use a more memory-efficient approach by storing references instead of copies
-        # Only create copies when the dataframe is actually modified
-        self._cache_user_transactions = {}
+        df = self.data_manager.df_transactions
 
         # Convert client_id to int once to avoid repeated conversions
-        df = self.data_manager.df_transactions.copy()
         if not pd.api.types.is_integer_dtype(df['client_id']):
-            df['client_id'] = df['client_id'].astype(int)
+            df = df.astype({'client_id': int})
 
-        # Group by client_id and store references to the groups
-        for user_id, group in df.groupby("client_id"):
-            self._cache_user_transactions[int(user_id)] = group
+        # Only reorder (and thereby copy) the transactions if they are not sorted by client_id already
+        if df["client_id"].is_monotonic_increasing:
+            self._cache_user_transactions = df
+        else:
+            order = np.argsort(df["client_id"].to_numpy(), kind="stable")
+            self._cache_user_transactions = df.take(order)
+        self._user_transaction_offsets = self._build_user_row_offsets(self._cache_user_transactions)
 
-    def cache_user_merchant_agg(self):
+    @staticmethod
+    def _build_user_row_offsets(df: pd.DataFrame) -> dict[int, tuple[int, int]]:
         """
-        Caches aggregated user merchant data.
+        Builds the (start, end) row range of each user in a DataFrame sorted by client ID.
 
-        This method processes user transaction data to calculate and cache aggregated
-        information by merchant and MCC (Merchant Category Code) for each user. It
-        groups the data by merchant ID and MCC, computes the total transaction count
-        and sum of amounts for each group, adds merchant category descriptions, and
-        stores the results in a dictionary.
+        Expects df to be sorted by "client_id", so that the rows of each user form one
+        contiguous block.
 
-        Attributes:
-            _cache_user_merchant_agg (dict[int, DataFrame]): A dictionary mapping user
-            IDs (int) to their corresponding aggregated transaction data (DataFrame).
-            Each DataFrame contains the merchant ID, MCC, transaction count, total
-            transaction amount, and merchant category description for the user.
+        Args:
+            df (pd.DataFrame): The DataFrame sorted by "client_id".
 
-        Raises:
-            KeyError: Raised if certain keys or values are not present in the input
-            data or dictionaries during processing.
+        Returns:
+            dict[int, tuple[int, int]]: A dictionary mapping user IDs to their row range.
+        """
+        if df.empty:
+            return {}
 
+        client_ids = df["client_id"].to_numpy()
+        user_ids, starts = np.unique(client_ids, return_index=True)
+        ends = np.append(starts[1:], len(client_ids))
+        return {
+            int(user_id): (start, end) for user_id, start, end in zip(user_ids.tolist(), starts.tolist(), ends.tolist())
+        }
+
+    @staticmethod
+    def _build_user_sort_orders(df: pd.DataFrame, columns: tuple[str, ...]) -> dict[str, np.ndarray]:
         """
-        # Pre-create the dictionary to avoid resizing
-        self._cache_user_merchant_agg = {}
+        Builds, for each given column, a row order of a DataFrame sorted by client ID in which
+        the rows of each user are sorted by that column in descending order.
 
-        # Create a mapping of MCC codes to descriptions once instead of repeatedly calling the function
-        df_mcc = self.data_manager.df_mcc
-        unique_mccs = set()
+        The order keeps the row ranges of the users, so the top rows of a user are the first
+        entries of order[start:end]. Ties keep their original row order, like nlargest.
 
-        # First collect all unique MCCs
-        for _, df_tx in self._cache_user_transactions.items():
-            if 'mcc' in df_tx.columns:
-                unique_mccs.update(df_tx['mcc'].unique())
+        Args:
+            df (pd.DataFrame): The DataFrame sorted by "client_id".
+            columns (tuple[str, ...]): The numeric columns to build a row order for.
 
-        # Create the mapping dictionary
-        mcc_to_desc = {
-            int(mcc): get_mcc_description_by_merchant_id(df_mcc, int(mcc))
-            for mcc in unique_mccs if pd.notna(mcc)
-        }
+        Returns:
+            dict[str, np.ndarray]: A dictionary mapping each column to its row order.
+        """
+        if df.empty:
+            return {}
 
-        # Process each user's transactions
-        for user_id, df_tx in self._cache_user_transactions.items():
-            # Skip if dataframe is empty
-            if df_tx.empty:
-                continue
+        client_ids = df["client_id"].to_numpy()
+        # lexsort is stable and sorts by the last key first
+        return {column: np.lexsort((-df[column].to_numpy(), client_ids)) for column in columns}
 
-            # Perform aggregation
-            agg = df_tx.groupby(["merchant_id", "mcc"]).agg(
-                tx_count=("amount", "size"),
-                total_sum=("amount", "sum")
-            ).reset_index()
+    def cache_user_merchant_agg(self):
+        """
+        Caches aggregated user merchant data.
 
-            # Skip if aggregation is empty
-            if agg.empty:
-                continue
+        This method processes user transaction data to calculate and cache aggregated
+        information by merchant and MCC (Merchant Category Code) for each user. It
+        groups all transactions by client ID, merchant ID and MCC in a single pass,
+        computes the total transaction count and sum of amounts for each group, adds
+        merchant category descriptions, and keeps the result as one DataFrame sorted
+        by client ID together with the row range of each user.
 
-            # Add MCC description using the pre-computed mapping
-            # Convert MCC to int once for the whole column
-            if not pd.api.types.is_integer_dtype(agg['mcc']):
-                agg['mcc'] = agg['mcc'].astype(int)
+        Attributes:
+            _cache_user_merchant_agg (DataFrame): The aggregated transaction data of all
+            users, containing the client ID, merchant ID, MCC, transaction count, total
+            transaction amount, and merchant category description.
+            _user_merchant_agg_offsets (dict[int, tuple[int, int]]): A dictionary mapping
+            user IDs (int) to the (start, end) row range of their aggregated data.
+            _user_merchant_agg_orders (dict[str, np.ndarray]): The row orders by transaction
+            count and by total sum, used to select the top merchants of a user.
 
-            # Use vectorized mapping instead of apply with lambda
-            agg["mcc_desc"] = agg["mcc"].map(mcc_to_desc)
+        Raises:
+            KeyError: Raised if certain keys or values are not present in the input
+            data or dictionaries during processing.
 
-            # Filter out rows with tx_count == 0 or total_sum == 0
-            # This is more efficient than filtering after the fact
-            mask = (agg["tx_count"] != 0) & (agg["total_sum"] != 0)
-            if not mask.all():
-                agg = agg[mask]
+        """
+        self._cache_user_merchant_agg = pd.DataFrame()
+        self._user_merchant_agg_offsets = {}
+        self._user_merchant_agg_orders = {}
+
+        # Aggregate all users at once instead of running one groupby per user.
+        # The result is sorted by the keys, which keeps each user's rows contiguous for the row ranges below
+        agg = aggregate_count_sum(
+            self.data_manager.df_transactions,
+            keys=["client_id", "merchant_id", "mcc"],
+            value_col="amount",
+            count_name="tx_count",
+            sum_name="total_sum"
+        )
+
+        # Skip if aggregation is empty
+        if agg.empty:
+            return
 
-            self._cache_user_merchant_agg[int(user_id)] = agg
+        # Convert MCC to int once for the whole column
+        if not pd.api.types.is_integer_dtype(agg['mcc']):
+            agg['mcc'] = agg['mcc'].astype(int)
+
+        # Add MCC description by indexing the DataManager's dense code -> description array
+        mcc_desc_lookup = self.data_manager.mcc_desc_lookup
+        mcc = agg["mcc"].to_numpy()
+        known = (mcc >= 0) & (mcc < len(mcc_desc_lookup))
+        mcc_desc = np.full(len(mcc), None, dtype=object)
+        mcc_desc[known] = mcc_desc_lookup[mcc[known]]
+        agg["mcc_desc"] = pd.Series(mcc_desc, index=agg.index).fillna("Undefined")
+
+        # Filter out rows with tx_count == 0 or total_sum == 0
+        mask = (agg["tx_count"] != 0) & (agg["total_sum"] != 0)
+        if not mask.all():
+            agg = agg[mask]
+
+        self._cache_user_merchant_agg = agg.reset_index(drop=True)
+        self._user_merchant_agg_offsets = self._build_user_row_offsets(self._cache_user_merchant_agg)
+        self._user_merchant_agg_orders = self._build_user_sort_orders(
+            self._cache_user_merchant_agg, MERCHANT_AGG_SORT_COLUMNS
+        )
+
+    def cache_kpi_tables(self):
+        """
+        Precomputes the user and card KPIs into flat NumPy arrays.
+
+        All users (from df_users, df_transactions and df_cards) get one row in a set of
+        struct-of-arrays tables holding the transaction count, total sum, average amount,
+        card count and summed credit limit. Cards get their own table holding the row of
+        their owner and their individual credit limit. Lookups in get_user_kpis and
+        get_card_kpis are therefore a single dict access plus an array index instead of
+        a scan over df_transactions / df_cards.
+        """
+        df_tx = self.data_manager.df_transactions
+        df_cards = self.data_manager.df_cards
+
+        tx_stats = df_tx.groupby("client_id", sort=False)["amount"].agg(["size", "sum", "mean"])
+        # Sum the (possibly float32) credit limits in float64
+        card_stats = df_cards["credit_limit"].astype(np.float64).groupby(df_cards["client_id"], sort=False).agg(
+            ["size", "sum"]
+        )
+
+        # Dense row index over every known user ID
+        user_ids = np.union1d(
+            np.union1d(self.data_manager.df_users["id"].to_numpy(np.int64), tx_stats.index.to_numpy(np.int64)),
+            card_stats.index.to_numpy(np.int64)
+        )
+        tx_stats = tx_stats.reindex(user_ids).fillna(0)
+        card_stats = card_stats.reindex(user_ids).fillna(0)
+
+        self._kpi_row_by_user = dict(zip(user_ids.tolist(), range(len(user_ids))))
+        self._kpi_user_ids = user_ids
+        self._kpi_tx_count = tx_stats["size"].to_numpy(np.int64)
+        self._kpi_total_sum = tx_stats["sum"].to_numpy(np.float64)
+        self._kpi_average_amount = tx_stats["mean"].to_numpy(np.float64)
+        self._kpi_card_count = card_stats["size"].to_numpy(np.int64)
+        self._kpi_credit_limit = card_stats["sum"].to_numpy(np.float64)
+
+        card_ids = df_cards["id"].to_numpy(np.int64)
+        self._kpi_row_by_card = dict(zip(card_ids.tolist(), range(len(card_ids))))
+        self._kpi_card_user_row = np.fromiter(
+            (self._kpi_row_by_user[client_id] for client_id in df_cards["client_id"].to_numpy(np.int64).tolist()),
+            dtype=np.int64, count=len(card_ids)
+        )
+        self._kpi_card_credit_limit = df_cards["credit_limit"].to_numpy(np.float64)
+
+        # Credit limits and card IDs per user, sorted by credit limit (highest first)
+        card_client_ids = df_cards["client_id"].to_numpy(np.int64)
+        order = np.lexsort((-self._kpi_card_credit_limit, card_client_ids))
+        sorted_client_ids = card_client_ids[order]
+        sorted_limits = self._kpi_card_credit_limit[order]
+        sorted_card_ids = card_ids[order]
+        # The per-user slices below are views that get shared with every caller, so guard them against writes
+        sorted_limits.setflags(write=False)
+        sorted_card_ids.setflags(write=False)
+        client_ids, starts = np.unique(sorted_client_ids, return_index=True)
+        ends = np.append(starts[1:], len(order))
+        self._card_limits_by_user = {
+            client_id: (sorted_limits[start:end], sorted_card_ids[start:end])
+            for client_id, start, end in zip(client_ids.tolist(), starts.tolist(), ends.tolist())
+        }
 
-    def get_user_kpis(self, user_id: int) -> dict:
+    def get_user_kpis(self, user_id: int) -> tuple[int, float, float, int, float] | None:
         """
         Returns key performance indicators (KPIs) of a specified user based
-        on their transactions and card information. This method calculates
-        details like the number of transactions, total transaction sum,
-        average transaction amount, the number of cards owned, and the
-        sum of credit limits available to the user.
+        on their transactions and card information. The values are read from
+        the tables precomputed in cache_kpi_tables.
 
         Args:
             user_id (int): The unique identifier of the user for whom to
-                calculate the KPIs.
+                return the KPIs.
 
         Returns:
-            dict: A dictionary containing the following KPIs:
-                - "amount_of_transactions" (int): The total number of
+            tuple | None: None if the user is unknown, otherwise a tuple of
+                - amount_of_transactions (int): The total number of
                   transactions made by the user.
-                - "total_sum" (float): The sum of all transaction amounts
+                - total_sum (float): The sum of all transaction amounts
                   related to the user.
-                - "average_amount" (float): The average value of the user's
+                - average_amount (float): The average value of the user's
                   transactions, or 0 if no transactions exist.
-                - "amount_of_cards" (int): The total number of cards the user
+                - amount_of_cards (int): The total number of cards the user
                   owns.
-                - "credit_limit" (float): The combined credit limit from all
+                - credit_limit (float): The combined credit limit from all
                   cards the user possesses.
         """
-        # Make sure to compare client_id as int
-        tx = self.data_manager.df_transactions[
-            self.data_manager.df_transactions["client_id"].astype(int) == int(user_id)]
-        cards_user = self.data_manager.df_cards[self.data_manager.df_cards["client_id"].astype(int) == int(user_id)]
-        credit_limit = cards_user["credit_limit"].sum() if not cards_user.empty else 0
-
-        return {
-            "amount_of_transactions": tx.shape[0],
-            "total_sum": tx["amount"].sum(),
-            "average_amount": tx["amount"].mean() if tx.shape[0] > 0 else 0,
-            "amount_of_cards": cards_user.shape[0],
-            "credit_limit": credit_limit
-        }
-
-    def get_card_kpis(self, card_id: int) -> dict:
+        row = self._kpi_row_by_user.get(int(user_id))
+        if row is None:
+            return None
+
+        return (
+            int(self._kpi_tx_count[row]),
+            float(self._kpi_total_sum[row]),
+            float(self._kpi_average_amount[row]),
+            int(self._kpi_card_count[row]),
+            float(self._kpi_credit_limit[row])
+        )
+
+    def get_card_kpis(self, card_id: int) -> tuple[int, float, float, int, float] | None:
         """
         Provides KPIs for a specific card, including transaction details and card credit limit.
 
@@ -164,36 +282,55 @@ class UserTabData:
 
         Returns
         -------
-        dict
-            A dictionary containing the following key-value pairs:
-                - amount_of_transactions (int): Number of transactions associated with
-                  the card.
-                - total_sum (int): Total sum of all transactions related to the card.
-                - average_amount (int): Average transaction amount for the card.
-                - amount_of_cards (int): Total number of active cards associated with
-                  the same user as the specified card.
-                - credit_limit (Optional[int]): The credit limit of the given card. It
-                  is set to None if the specified card does not exist.
-        """
-        # Find the card
-        card_row = self.data_manager.df_cards[self.data_manager.df_cards["id"] == card_id]
-        if card_row.empty:
-            return {
-                "amount_of_transactions": 0,
-                "total_sum": 0,
-                "average_amount": 0,
-                "amount_of_cards": 0,
-                "credit_limit": None
-            }
-        user_id = card_row.iloc[0]["client_id"]
-
-        # Get the card for that user
-        data = self.get_user_kpis(user_id)
-
-        # Overwrite credit limit with card's credit limit
-        data["credit_limit"] = card_row.iloc[0]["credit_limit"]
-
-        return data
+        tuple | None
+            None if the card is unknown, otherwise the same tuple as get_user_kpis
+            for the owner of the card, with the credit limit replaced by the credit
+            limit of the given card.
+        """
+        card_row = self._kpi_row_by_card.get(int(card_id))
+        if card_row is None:
+            return None
+
+        row = self._kpi_card_user_row[card_row]
+        return (
+            int(self._kpi_tx_count[row]),
+            float(self._kpi_total_sum[row]),
+            float(self._kpi_average_amount[row]),
+            int(self._kpi_card_count[row]),
+            float(self._kpi_card_credit_limit[card_row])
+        )
+
+    def get_card_owner(self, card_id: int) -> int | None:
+        """
+        Returns the ID of the user owning a card, using the card index built in
+        cache_kpi_tables instead of scanning df_cards.
+
+        Args:
+            card_id (int): The ID of the card.
+
+        Returns:
+            int | None: The ID of the card owner, or None if the card is unknown.
+        """
+        card_row = self._kpi_row_by_card.get(int(card_id))
+        if card_row is None:
+            return None
+
+        return int(self._kpi_user_ids[self._kpi_card_user_row[card_row]])
+
+    def get_user_card_limits(self, user_id: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Returns the credit limits and IDs of all cards of a user, sorted by credit limit
+        (highest first). The arrays are precomputed in cache_kpi_tables and shared, so
+        they are read-only.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: The sorted credit limits and the matching
+                card IDs, or None if the user has no cards.
+        """
+        return self._card_limits_by_user.get(int(user_id))
 
     def get_credit_limit(self, user_id: int = None, card_id: int = None):
         """
@@ -201,10 +338,10 @@ class UserTabData:
 
         This method determines the credit limit by checking the provided user
         or card ID. If a card ID is given, it retrieves the credit limit for
-        that specific card. If a user ID is given, it calculates the total
-        credit limit for all cards associated with the user. If neither user
-        ID nor card ID is provided, or no information is found, the method
-        returns None.
+        that specific card. If a user ID is given, it returns the total credit
+        limit for all cards associated with the user. Both values are read from
+        the KPI tables precomputed in cache_kpi_tables. If neither user ID nor
+        card ID is provided, or no information is found, the method returns None.
 
         Args:
             user_id: int, optional
@@ -218,22 +355,23 @@ class UserTabData:
                 otherwise None.
         """
         if card_id is not None:
-            card_row = self.data_manager.df_cards[self.data_manager.df_cards["id"] == card_id]
-            if not card_row.empty:
-                return float(card_row.iloc[0]["credit_limit"])
+            card_row = self._kpi_row_by_card.get(int(card_id))
+            if card_row is not None:
+                return float(self._kpi_card_credit_limit[card_row])
         if user_id is not None:
-            user_cards = self.data_manager.df_cards[self.data_manager.df_cards["client_id"] == user_id]
-            if not user_cards.empty:
-                return float(user_cards["credit_limit"].sum())
+            row = self._kpi_row_by_user.get(int(user_id))
+            if row is not None and self._kpi_card_count[row] > 0:
+                return float(self._kpi_credit_limit[row])
         return None
 
     def get_user_transactions(self, user_id: int) -> pd.DataFrame:
         """
         Retrieves the transactions associated with a specific user from the cache.
 
-        This method accesses a cached record of user transactions and retrieves the
-        transactions for the given user ID. If no transactions are found for the
-        specified user ID, it returns an empty DataFrame.
+        This method looks up the row range of the given user ID in the sorted
+        transactions cache and returns that slice, so no full-column scan or boolean
+        mask is needed. If no transactions are found for the specified user ID, it
+        returns an empty DataFrame.
 
         Args:
             user_id: The unique identifier of the user whose transactions are
@@ -244,16 +382,19 @@ class UserTabData:
             user ID. If no transactions exist for the user, an empty DataFrame
             is returned.
         """
-        return self._cache_user_transactions.get(int(user_id), pd.DataFrame())
+        bounds = self._user_transaction_offsets.get(int(user_id))
+        if bounds is None:
+            return pd.DataFrame()
+        return self._cache_user_transactions.iloc[bounds[0]:bounds[1]]
 
     def get_user_merchant_agg(self, user_id: int) -> pd.DataFrame:
         """
         Retrieve aggregated merchant data for a specific user from cache.
 
         This method fetches pre-aggregated merchant-level data for a given user from
-        the cache. If no data is found for the user in the cache, it returns an empty
-        pandas DataFrame. This function is useful for retrieving cached user-specific
-        data quickly.
+        the cache by slicing the user's row range. If no data is found for the user in
+        the cache, it returns an empty pandas DataFrame. This function is useful for
+        retrieving cached user-specific data quickly.
 
         Args:
             user_id (int): The ID of the user whose merchant aggregated data is to
@@ -264,66 +405,34 @@ class UserTabData:
             data for the specified user. Returns an empty DataFrame if no data is
             cached for the given user.
         """
-        return self._cache_user_merchant_agg.get(int(user_id), pd.DataFrame())
-
-    def _convert_dict_to_df(self, cache_dict, cache_name):
-        """
-        Convert a dictionary of dataframes to a single dataframe with user_id column.
-
-        Args:
-            cache_dict (dict): Dictionary mapping user_id to dataframe
-            cache_name (str): Name of the cache for logging
-
-        Returns:
-            pd.DataFrame: Combined dataframe with user_id column
-        """
-        if not cache_dict:
-            logger.log(f"ℹ️ User: Empty {cache_name} cache, returning empty dataframe", indent_level=4)
-            return pd.DataFrame()
-
-        # Create a list to store dataframes with user_id
-        dfs = []
-
-        # Process each user's dataframe
-        for user_id, df in cache_dict.items():
-            if df is not None and not df.empty:
-                # Create a copy to avoid modifying the original
-                df_copy = df.copy()
-                # Add user_id column
-                df_copy['user_id'] = user_id
-                dfs.append(df_copy)
-
-        # Combine all dataframes
-        if dfs:
-            return pd.concat(dfs, ignore_index=True)
-        else:
+        bounds = self._user_merchant_agg_offsets.get(int(user_id))
+        if bounds is None:
             return pd.DataFrame()
+        return self._cache_user_merchant_agg.iloc[bounds[0]:bounds[1]]
 
-    def _convert_df_to_dict(self, df, cache_name):
+    def get_user_top_merchants(self, user_id: int, sort_column: str, limit: int) -> pd.DataFrame:
         """
-        Convert a dataframe with user_id column back to a dictionary of dataframes.
+        Retrieve the top rows of the aggregated merchant data of a user by a given column.
+
+        The rows are taken from the per-user row order precomputed for the column, so no
+        sorting happens at request time.
 
         Args:
-            df (pd.DataFrame): Combined dataframe with user_id column
-            cache_name (str): Name of the cache for logging
+            user_id (int): The ID of the user.
+            sort_column (str): The column to rank by, "tx_count" or "total_sum".
+            limit (int): The maximum number of rows to return.
 
         Returns:
-            dict: Dictionary mapping user_id to dataframe
+            pd.DataFrame: Up to limit rows of the user's aggregated merchant data, sorted by
+            sort_column in descending order. Returns an empty DataFrame if no data is cached
+            for the given user.
         """
-        if df is None or df.empty:
-            logger.log(f"ℹ️ User: Empty {cache_name} dataframe, returning empty dictionary", indent_level=4)
-            return {}
-
-        # Create a dictionary to store the result
-        result = {}
-
-        # Group by user_id
-        for user_id, group in df.groupby('user_id'):
-            # Remove the user_id column from the group
-            group_without_user_id = group.drop('user_id', axis=1)
-            result[int(user_id)] = group_without_user_id
-
-        return result
+        bounds = self._user_merchant_agg_offsets.get(int(user_id))
+        if bounds is None:
+            return pd.DataFrame()
+        start, end = bounds
+        rows = self._user_merchant_agg_orders[sort_column][start:min(end, start + limit)]
+        return self._cache_user_merchant_agg.take(rows)
 
     def _save_caches_to_disk(self):
         """
@@ -332,13 +441,9 @@ class UserTabData:
         logger.log("🔄 User: Saving caches to disk...", indent_level=3)
         bm = Benchmark("User: Saving caches to disk")
 
-        # Convert dictionaries to dataframes and save as parquet
-        transactions_df = self._convert_dict_to_df(self._cache_user_transactions, "user_transactions")
-        merchant_agg_df = self._convert_dict_to_df(self._cache_user_merchant_agg, "user_merchant_agg")
-
-        # Save dataframes as parquet files
-        self.data_manager.save_cache_to_disk("user_transactions_df", transactions_df)
-        self.data_manager.save_cache_to_disk("user_merchant_agg_df", merchant_agg_df)
+        # Save dataframes as parquet files (both are single dataframes sorted by client_id)
+        self.data_manager.save_cache_to_disk("user_transactions_sorted_df", self._cache_user_transactions)
+        self.data_manager.save_cache_to_disk("user_merchant_agg_sorted_df", self._cache_user_merchant_agg)
 
         bm.print_time(level=4)
 
@@ -353,15 +458,18 @@ class UserTabData:
         bm = Benchmark("User: Loading caches from disk")
 
         # Load from parquet files
-        transactions_df = self.data_manager.load_cache_from_disk("user_transactions_df")
-        merchant_agg_df = self.data_manager.load_cache_from_disk("user_merchant_agg_df")
+        transactions_df = self.data_manager.load_cache_from_disk("user_transactions_sorted_df")
+        merchant_agg_df = self.data_manager.load_cache_from_disk("user_merchant_agg_sorted_df")
 
         if transactions_df is not None and merchant_agg_df is not None:
             logger.log("✅ User: Successfully loaded caches from parquet files", indent_level=4)
 
-            # Convert dataframes back to dictionaries
-            self._cache_user_transactions = self._convert_df_to_dict(transactions_df, "user_transactions")
-            self._cache_user_merchant_agg = self._convert_df_to_dict(merchant_agg_df, "user_merchant_agg")
+            # Restore the sorted dataframes together with their row offsets
+            self._cache_user_transactions = transactions_df
+            self._user_transaction_offsets = self._build_user_row_offsets(transactions_df)
+            self._cache_user_merchant_agg = merchant_agg_df
+            self._user_merchant_agg_offsets = self._build_user_row_offsets(merchant_agg_df)
+            self._user_merchant_agg_orders = self._build_user_sort_orders(merchant_agg_df, MERCHANT_AGG_SORT_COLUMNS)
 
             bm.print_time(level=4)
             return True
@@ -384,6 +492,9 @@ class UserTabData:
         logger.log("🔄 User: Pre-caching User-Tab data...", indent_level=3, add_line_before=True)
         bm_pre_cache_full = Benchmark("User: Pre-caching User-Tab data")
 
+        # KPI tables are cheap to build and always kept in memory only
+        self.cache_kpi_tables()
+
         # Try to load caches from disk first
         if self._load_caches_from_disk():
             logger.log("✅ User: Successfully loaded caches from disk", indent_level=3)
@@ -8,7 +8,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import us
-from dash import dash_table, html, dcc
+from dash import dash_table, html, dcc, Patch
 from plotly.graph_objs._figure import Figure
 from shapely.geometry import shape
 
@@ -651,6 +651,56 @@ def create_bar_chart(
     return fig
 
 
+def create_bar_chart_theme_patch(dark_mode: bool) -> Patch:
+    """
+    Creates a partial figure update that switches a chart built by create_bar_chart to
+    the light or dark theme.
+
+    Only the theme dependent colors (fonts, axis lines and grid) are set, so toggling
+    dark mode does not require rebuilding and re-sending the whole figure.
+
+    Args:
+        dark_mode (bool): Whether the chart should be styled for dark mode.
+
+    Returns:
+        Patch: The partial update to return for the figure property of the chart.
+    """
+    text_color = const.TEXT_COLOR_DARK if dark_mode else const.TEXT_COLOR_LIGHT
+    grid_color = const.GRAPH_GRID_COLOR_DARK if dark_mode else const.GRAPH_GRID_COLOR_LIGHT
+
+    patch = Patch()
+    patch["layout"]["font"]["color"] = text_color
+    patch["layout"]["title"]["font"]["color"] = text_color
+    patch["layout"]["legend"]["font"]["color"] = text_color
+    patch["layout"]["xaxis"]["title"]["font"]["color"] = text_color
+    patch["layout"]["xaxis"]["tickfont"]["color"] = text_color
+    patch["layout"]["xaxis"]["linecolor"] = grid_color
+    patch["layout"]["yaxis"]["title"]["font"]["color"] = text_color
+    patch["layout"]["yaxis"]["tickfont"]["color"] = text_color
+    patch["layout"]["yaxis"]["linecolor"] = grid_color
+    patch["layout"]["yaxis"]["gridcolor"] = grid_color
+    patch["layout"]["yaxis"]["zerolinecolor"] = grid_color
+    return patch
+
+
+def create_figure_data_patch(figure: dict) -> Patch:
+    """
+    Creates a partial figure update that replaces only the traces of a rendered chart.
+
+    Useful when a chart shows different data with an unchanged layout (same titles, axes and
+    theme), so the layout including its template does not have to be re-sent.
+
+    Args:
+        figure (dict): The figure dict holding the new traces under "data".
+
+    Returns:
+        Patch: The partial update to return for the figure property of the chart.
+    """
+    patch = Patch()
+    patch["data"] = figure["data"]
+    return patch
+
+
 def create_empty_figure():
     """
     Creates an empty Plotly figure with a transparent background, invisible axes, and
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import components.factories.component_factory as comp_factory
 from backend.data_manager import DataManager
 from components.constants import COLOR_BLUE_MAIN
@@ -7,6 +9,7 @@ dm: DataManager = DataManager.get_instance()
 # === Constants ===
 UNKNOWN_VALUE = "Unknown"
 SORT_BY_COUNT = "count"
+TOP_MERCHANTS_LIMIT = 10  # Number of bars shown in the merchant bar chart
 TRANSACTION_COUNT_TITLE = "USER'S TOP MERCHANTS BY TRANSACTION COUNT"
 TOTAL_SPENDING_TITLE = "USER'S TOP MERCHANTS BY TOTAL SPENDING"
 HOVER_TEMPLATE_BASE = (
@@ -16,6 +19,73 @@ HOVER_TEMPLATE_BASE = (
 )
 
 
+def _normalize_input(value) -> str:
+    """
+    Normalizes a raw search input value into its stripped text ("" if the input is empty).
+    Only strings can carry whitespace, so other values are converted without stripping.
+    """
+    if isinstance(value, str):
+        return value.strip()
+    return "" if value is None else str(value)
+
+
+def _parse_id(text: str) -> int | None:
+    """
+    Parses a normalized, non-empty search input value into an ID without going through
+    int()'s exception path. Only plain non-negative integers (ASCII digits) are accepted.
+
+    Args:
+        text (str): The normalized input value.
+
+    Returns:
+        int | None: The parsed ID, or None if the value is not a valid ID.
+    """
+    return int(text) if text.isascii() and text.isdigit() else None
+
+
+@lru_cache(maxsize=2048)
+def _resolve_ids_cached(user_id: str, card_id: str) -> tuple[int | None, int | None] | None:
+    """
+    Memoized implementation of resolve_ids, keyed on the normalized input values.
+    """
+    if card_id:
+        card_id = _parse_id(card_id)
+        if card_id is None:
+            return None
+        return dm.user_tab_data.get_card_owner(card_id), card_id
+
+    if not user_id:
+        return None, None
+
+    user_id = _parse_id(user_id)
+    if user_id is None:
+        return None
+    return user_id, None
+
+
+def resolve_ids(user_id, card_id) -> tuple[int | None, int | None] | None:
+    """
+    Resolves the raw values of the user ID and card ID search inputs in one place.
+
+    The card ID takes precedence over the user ID. If a card ID is given, it is parsed
+    and the ID of the card owner is looked up; otherwise the user ID is parsed. All user
+    tab callbacks receive the same pair of input values, so the inputs are normalized
+    (None and whitespace-only become "", ints and padded strings become their stripped
+    text) and the result is memoized on the normalized values. The parsing / card owner
+    lookup therefore only happens once per distinct input, however it was typed.
+
+    Args:
+        user_id (str or int): The value of the user ID search input.
+        card_id (str or int): The value of the card ID search input.
+
+    Returns:
+        tuple[int | None, int | None] | None: The resolved user ID (None if both inputs are
+            empty or the card is unknown) and the parsed card ID (None if no card ID was
+            given), or None if the given card ID or user ID is not a valid ID.
+    """
+    return _resolve_ids_cached(_normalize_input(user_id), _normalize_input(card_id))
+
+
 def get_valid_user_id(user_id, card_id):
     """
     Retrieve a valid user ID based on provided user ID and card ID.
@@ -34,31 +104,18 @@ def get_valid_user_id(user_id, card_id):
         int or None: The validated user ID as an integer, or None if both inputs are invalid
         or empty.
     """
-    if card_id is not None and str(card_id).strip() != "":
-        try:
-            card_row = dm.df_cards[dm.df_cards["id"] == int(card_id)]
-            return int(card_row.iloc[0]["client_id"]) if not card_row.empty else None
-        except Exception:
-            return None
-
-    if user_id is None or str(user_id).strip() == "":
-        return None
-
-    try:
-        return int(user_id)
-    except Exception:
-        return None
+    ids = resolve_ids(user_id, card_id)
+    return ids[0] if ids is not None else None
 
 
 def configure_chart_parameters(agg, sort_by):
     """
     Configures chart parameters based on sorting criteria.
 
-    This function adjusts aggregate data and defines configuration
-    parameters for generating a chart. The configuration depends on
-    whether the data should be sorted by transaction count or total
-    sum. The returned configuration includes columns, titles, and
-    hover information.
+    This function defines configuration parameters for generating
+    a chart. The configuration depends on whether the data should be
+    sorted by transaction count or total sum. The returned configuration
+    includes columns, titles, and hover information.
 
     Args:
         agg: A DataFrame representing the aggregated data to be used
@@ -71,7 +128,6 @@ def configure_chart_parameters(agg, sort_by):
         column names, chart titles, and hover template formats.
     """
     if sort_by == SORT_BY_COUNT:
-        agg.sort_values("tx_count", ascending=False)
         return {
             "x_col": "tx_count",
             "x_title": "TRANSACTION COUNT",
@@ -79,7 +135,6 @@ def configure_chart_parameters(agg, sort_by):
             "bar_title": TRANSACTION_COUNT_TITLE
         }
     else:
-        agg.sort_values("total_sum", ascending=False)
         return {
             "x_col": "total_sum",
             "x_title": "TOTAL AMOUNT",
@@ -93,10 +148,11 @@ def create_bar_chart_figure(agg, params, dark_mode):
     Creates a bar chart figure using aggregated data and specific parameters.
 
     This function generates a bar chart based on the input aggregated data and a set of
-    dynamic parameters. It uses a customizable hover template and applies styling for
-    dark or light mode. It leverages a component factory to handle chart creation and
-    ensures the resulting chart has a consistent appearance with provided labels, colors,
-    and settings.
+    dynamic parameters. Only the top TOP_MERCHANTS_LIMIT rows by the configured column
+    are plotted, selected with nlargest instead of a full sort. It uses a customizable
+    hover template and applies styling for dark or light mode. It leverages a component
+    factory to handle chart creation and ensures the resulting chart has a consistent
+    appearance with provided labels, colors, and settings.
 
     Args:
         agg (DataFrame): The aggregated data used for plotting the bar chart.
@@ -113,7 +169,7 @@ def create_bar_chart_figure(agg, params, dark_mode):
         Figure: A Plotly figure object representing the bar chart.
     """
     hover_template = HOVER_TEMPLATE_BASE + params["hover_last_row"] + "<extra></extra>"
-    agg = agg.copy()
+    agg = agg.nlargest(TOP_MERCHANTS_LIMIT, params["x_col"])
     agg["mcc_desc"] = agg["mcc_desc"].astype(str).str.upper()
 
     return comp_factory.create_bar_chart(
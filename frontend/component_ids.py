@@ -121,12 +121,14 @@ class ID(str, Enum):
     USER_TAB_HEADING = "user-tab-heading"
     USER_ID_SEARCH_INPUT = "user-id-search-input"
     CARD_ID_SEARCH_INPUT = "card-id-search-input"
+    USER_PARSED_IDS_STORE = "user-parsed-ids-store"
     USER_KPI_TX_COUNT = "kpi-user-tx-count"
     USER_KPI_TX_SUM = "kpi-user-tx-sum"
     USER_KPI_TX_AVG = "kpi-user-tx-avg"
     USER_KPI_CARD_COUNT = "kpi-user-card-count"
     USER_CREDIT_LIMIT_BOX = "user-credit-limit-box"
     USER_MERCHANT_BAR_CHART = "user-merchant-bar-chart"
+    USER_MERCHANT_BAR_CHART_STATE_STORE = "user-merchant-bar-chart-state-store"
     USER_MERCHANT_SORT_DROPDOWN = "merchant-sort-dropdown"
     USER_CREDIT_LIMIT_BAR = "user-credit-limit-bar"
     USER_TAB_BAR_INFO_ICON = "user-tab-bar-info-icon"
@@ -14,6 +14,9 @@ MODEBAR_CONFIG = dict(
     displaylogo=False
 )
 
+DEFAULT_USER_ID = 1098  # User shown when the tab is opened
+SEARCH_DEBOUNCE_SECONDS = 0.3  # Typing pause after which a search input value is sent
+
 BAR_CHART_OPTIONS = [
     {"label": "TOTAL AMOUNT", "value": "amount"},
     {"label": "TRANSACTION COUNT", "value": "count"},
@@ -103,11 +106,14 @@ def _create_search_bars() -> html.Div:
         children=[
 
             _create_single_search_bar(ID.USER_ID_SEARCH_INPUT, f"SEARCH BY USER ID ({min_user_id} - {max_user_id})",
-                                      start_value=1098,
+                                      start_value=DEFAULT_USER_ID,
                                       min_value=min_user_id, max_value=max_user_id),
 
             _create_single_search_bar(ID.CARD_ID_SEARCH_INPUT, f"SEARCH BY CARD ID ({min_card_id} - {max_card_id})",
-                                      min_value=min_card_id, max_value=max_card_id)
+                                      min_value=min_card_id, max_value=max_card_id),
+
+            # Search inputs parsed in the browser, initialized with the start values of the inputs
+            dcc.Store(id=ID.USER_PARSED_IDS_STORE, data={"user_id": DEFAULT_USER_ID, "card_id": None}),
 
         ])
 
@@ -117,7 +123,8 @@ def _create_single_search_bar(input_id: str, placeholder: str, start_value: int
     """
     Creates a single search bar input element with the specified id, placeholder text, and optional start value. This
     component is constructed as a Dash Core Components Input element with the "search" type, designed for user input
-    related to search functionality.
+    related to search functionality. The value is debounced, so typing a multi-digit ID triggers the dependent
+    callbacks once instead of once per keystroke.
 
     Args:
         input_id: A unique identifier for the search bar input element.
@@ -134,6 +141,7 @@ def _create_single_search_bar(input_id: str, placeholder: str, start_value: int
         min=min_value,
         max=max_value,
         autoComplete="off",
+        debounce=SEARCH_DEBOUNCE_SECONDS,
         placeholder=placeholder,
         className="search-bar-input no-spinner"
     )
@@ -289,6 +297,10 @@ def _create_bottom_merchant_diagram() -> html.Div:
 
                             html.Div(className="map-spinner visible", id=ID.USER_BAR_CHART_SPINNER),
 
+                            # Resolved user ID, sort order and dark mode the chart was last rendered with (per
+                            # client), used to skip unchanged renders and to send only a theme or data Patch
+                            dcc.Store(id=ID.USER_MERCHANT_BAR_CHART_STATE_STORE),
+
                             comp_factory.create_info_icon(
                                 icon_id=ID.USER_TAB_BAR_INFO_ICON,
                                 style={
@@ -25,10 +25,9 @@ from backend.callbacks.tabs.tab_cluster_callbacks import (  # noqa: F401
     update_cluster, set_cluster_tab, toggle_legend
 )
 from backend.callbacks.tabs.tab_user_callbacks import (  # noqa: F401
-    update_user_kpis, update_credit_limit,
+    update_user_kpis,
     update_merchant_bar_chart,
-    bridge_user_to_merchant_tab,
-    toggle_inputs, update_tab_heading
+    bridge_user_to_merchant_tab
 )
 from backend.callbacks.tabs.tab_home_callbacks import (  # noqa: F401
     store_selected_state, update_all_pies,
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data_handler import aggregate_count_sum
+
+
+def _groupby_count_sum(df: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    return df.groupby(keys, observed=True, as_index=False).agg(
+        tx_count=("amount", "size"), total_sum=("amount", "sum")
+    )
+
+
+def test_aggregate_count_sum_matches_groupby_for_integer_keys():
+    df = pd.DataFrame({
+        "client_id": np.array([3, 1, 3, 2, 1, 3], dtype=np.int32),
+        "mcc": np.array([5411, 5812, 5411, 5411, 5812, 4829], dtype=np.int16),
+        "amount": [10.0, 2.5, np.nan, 7.0, 1.5, -3.0],
+    })
+
+    result = aggregate_count_sum(df, ["client_id", "mcc"], "amount", "tx_count", "total_sum")
+
+    expected = _groupby_count_sum(df, ["client_id", "mcc"])
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("key", [
+    pd.Series([1.0, np.nan, 1.0, 2.0]),
+    pd.Series(["b", "a", "b", "a"]),
+    pd.Series(["b", "a", "b", "a"], dtype="category"),
+    pd.Series([1, pd.NA, 1, 2], dtype="Int64"),
+])
+def test_aggregate_count_sum_falls_back_to_groupby_for_non_integer_keys(key):
+    df = pd.DataFrame({"key": key, "amount": [1.0, 2.0, 3.0, 4.0]})
+
+    result = aggregate_count_sum(df, ["key"], "amount", "tx_count", "total_sum")
+
+    pd.testing.assert_frame_equal(result, _groupby_count_sum(df, ["key"]))
+
+
+def test_aggregate_count_sum_handles_empty_frames():
+    df = pd.DataFrame({"key": pd.Series([], dtype=np.int64), "amount": pd.Series([], dtype=np.float64)})
+
+    result = aggregate_count_sum(df, ["key"], "amount", "tx_count", "total_sum")
+
+    assert result.empty
+    assert list(result.columns) == ["key", "tx_count", "total_sum"]